@@ -0,0 +1,66 @@
+"""Compares one batch search against running the searches one at a time.
+
+    python3 -m benchmarks.batch_search [number_of_videos] [number_of_terms]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.video_library import VideoLibrary
+from src.video_search import VideoSearch
+
+
+WORDS = ("amazing cats dogs funny life google video about nothing music live "
+         "cover tutorial review game play epic fail best compilation").split()
+
+
+def _catalog(directory, count, rng):
+    catalog = Path(directory) / "videos.txt"
+    with open(catalog, "w") as catalog_file:
+        for i in range(count):
+            title = " ".join(rng.choices(WORDS, k=4))
+            catalog_file.write(f"{title} | video_{i}_id | #tag{i % 100}\n")
+    return catalog
+
+
+def _terms(count, rng):
+    """Returns up to `count` distinct terms, at most as many as there are.
+
+    A term is a piece of a word followed either by a letter that makes it
+    miss or by the start of the next word, as in a phrase search.
+    """
+    pieces = {word[start:start + length]
+              for word in WORDS
+              for start in range(len(word))
+              for length in range(3, 7)}
+    endings = ["x", "y", "z", " "] + [" " + word[:3] for word in WORDS]
+    terms = sorted(piece + ending for piece in pieces for ending in endings)
+    return sorted(rng.sample(terms, min(count, len(terms))))
+
+
+if __name__ == "__main__":
+    videos = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    term_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    rng = random.Random(0)
+    terms = _terms(term_count, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        library = VideoLibrary(_catalog(directory, videos, rng))
+    search = VideoSearch(library, cache_size=0)
+
+    start = time.perf_counter()
+    all_videos = library.get_all_videos()
+    for term in terms:
+        term = term.lower()
+        [v for v in all_videos if not v.flag and term in v.title.lower()]
+    scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    search.batch(terms)
+    batch = time.perf_counter() - start
+
+    print(f"{len(terms)} terms over {videos} videos")
+    print(f"one scan per term: {scan:8.3f}s  {len(terms) / scan:10.1f} terms/s")
+    print(f"batch search:      {batch:8.3f}s  {len(terms) / batch:10.1f} terms/s")
@@ -0,0 +1,54 @@
+"""Compares loading a catalog in one process against parallel workers.
+
+Also times the part of a parallel load that stays in the parent process:
+turning the chunks the workers send back into rows. That part bounds how
+far the load can scale with cores.
+
+    python3 -m benchmarks.parallel_load [number_of_videos] [workers]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.video_library import (_chunk_boundaries, _load_catalog,
+                               _parse_chunk, _rows_from_chunk)
+
+
+def _catalog(directory, count):
+    catalog = Path(directory) / "videos.txt"
+    with open(catalog, "w") as catalog_file:
+        for i in range(count):
+            catalog_file.write(f"Video number {i} | video_{i}_id | "
+                               f"#tag{i % 50} , #topic{i % 7}\n")
+    return catalog
+
+
+def _time(load):
+    start = time.perf_counter()
+    load()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = _catalog(directory, count)
+        serial = _time(lambda: _load_catalog(catalog))
+        parallel = _time(lambda: _load_catalog(catalog, max(workers, 2)))
+
+        # What the parent does per chunk: unpickle it and split it into rows.
+        chunks = [pickle.dumps(_parse_chunk(catalog, start, end))
+                  for start, end in _chunk_boundaries(catalog, 16)]
+        parent = _time(lambda: [list(_rows_from_chunk(pickle.loads(chunk)))
+                                for chunk in chunks])
+
+    print(f"{count} videos, {max(workers, 2)} workers, "
+          f"{os.cpu_count()} cores")
+    print(f"one process:        {serial:8.3f}s")
+    print(f"parallel workers:   {parallel:8.3f}s")
+    print(f"parent-side rows:   {parent:8.3f}s")
@@ -0,0 +1,50 @@
+"""Compares rendering listing lines per call against the cached lines.
+
+The per-call rendering is the original VideoPlayer.video_details, which
+formats the tag tuple through str() and four replaces for every video.
+
+    python3 -m benchmarks.video_details [number_of_videos] [number_of_listings]
+"""
+
+import sys
+import time
+
+from src.video import Video
+
+
+def render(v):
+    """The original VideoPlayer.video_details."""
+    all_tags, flagstr = "", ""
+    if str(v.tags):
+        all_tags = str(v.tags).replace("'", "").replace(",", "").replace("(", "").replace(")", "")
+    if v.flag:
+        flagstr = f"- FLAGGED (reason: {v.flag_reason})"
+    return f" {v.title} ({v.video_id}) [{all_tags}] {flagstr}"
+
+
+def _videos(count):
+    return [Video(f"Video number {i}", f"video_{i}_id",
+                  [f"#tag{i % 50}", f"#topic{i % 7}"])
+            for i in range(count)]
+
+
+def _time(listing, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        listing()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    videos = _videos(count)
+    assert "\n".join(map(render, videos)) == "\n".join(
+        [v.details for v in videos])
+
+    per_call = _time(lambda: "\n".join(map(render, videos)), rounds)
+    cached = _time(lambda: "\n".join([v.details for v in videos]), rounds)
+    print(f"{rounds} listings of {count} videos")
+    print(f"rendered per call: {per_call:8.3f}s")
+    print(f"cached lines:      {cached:8.3f}s")
+    print(f"speed-up:          {per_call / cached:8.2f}x")
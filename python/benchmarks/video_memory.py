@@ -0,0 +1,70 @@
+"""Measures the memory held per Video with tracemalloc.
+
+Compares the current Video against the original dict-backed layout, for a
+synthetic catalog whose tags come from a small shared vocabulary. The cut
+is about 1.9x, short of the several-fold the work aimed for: about 130 of
+the remaining 220 bytes are the title and id strings, measured on their
+own below, which any layout has to keep. A column store could only save
+the Video object itself, while flags, playlists and library listeners all
+rely on Videos being objects with a stable identity, so it was not
+pursued.
+
+    python3 -m benchmarks.video_memory [number_of_videos]
+"""
+
+import sys
+import tracemalloc
+
+from src.video import Video
+
+
+class DictVideo:
+    """The original Video layout: a __dict__ and a private tag tuple each."""
+
+    def __init__(self, video_title, video_id, video_tags):
+        self._title = video_title
+        self._video_id = video_id
+        self._tags = tuple(video_tags)
+        self._flag = False
+        self._flag_reason = ""
+
+
+def _rows(count):
+    for i in range(count):
+        # Tag strings are rebuilt per row, as they are when parsing a file.
+        yield (f"Video number {i}", f"video_{i}_id",
+               [f"#tag{i % 50}", f"#topic{i % 7}"])
+
+
+def measure(video_class, count):
+    """Returns the bytes still allocated per video after loading `count`.
+
+    This includes the title and id strings, which both layouts keep.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    videos = [video_class(title, video_id, tags)
+              for title, video_id, tags in _rows(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(videos)
+
+
+def string_bytes(count):
+    """Returns the bytes per video of the title and id strings alone, the
+    floor for any layout that keeps them as str.
+    """
+    return sum(sys.getsizeof(title) + sys.getsizeof(video_id)
+               for title, video_id, _ in _rows(count)) / count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    baseline = measure(DictVideo, count)
+    compact = measure(Video, count)
+    floor = string_bytes(count)
+    print(f"{count} videos")
+    print(f"dict-backed Video: {baseline:8.1f} bytes/video")
+    print(f"compact Video:     {compact:8.1f} bytes/video")
+    print(f"reduction:         {baseline / compact:8.2f}x")
+    print(f"of which strings:  {floor:8.1f} bytes/video")
@@ -0,0 +1,150 @@
+"""Prefix completion over the words of video titles and tags."""
+
+from .library_listener import LibraryListener
+import heapq
+import re
+
+
+class _Node:
+    """A radix tree node, reached from its parent by the edge `label`."""
+
+    __slots__ = ("label", "children", "count", "best")
+
+    def __init__(self, label):
+        self.label = label
+        # First character of each child's label -> child
+        self.children = {}
+        # Number of videos containing the word that ends at this node
+        self.count = 0
+        # Highest count anywhere in this subtree
+        self.best = 0
+
+
+def _common_prefix_length(first, second):
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+class RadixTree:
+    """A class used to represent a compressed trie of counted words.
+
+    Each node also stores the highest word count in its subtree, so the most
+    frequent completions of a prefix can be found best-first without
+    visiting subtrees that cannot make the top N.
+    """
+
+    def __init__(self):
+        self._root = _Node("")
+
+    def add(self, word, delta):
+        """Changes the count of a word, adding or pruning nodes as needed."""
+        node = self._root
+        path = [node]
+        rest = word
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = node.children[rest[0]] = _Node(rest)
+                common = len(rest)
+            else:
+                common = _common_prefix_length(child.label, rest)
+                if common < len(child.label):
+                    # Split the edge where the word leaves it.
+                    middle = _Node(child.label[:common])
+                    child.label = child.label[common:]
+                    middle.children[child.label[0]] = child
+                    node.children[rest[0]] = middle
+                    child = middle
+            node = child
+            path.append(node)
+            rest = rest[common:]
+        node.count += delta
+
+        for parent, node in reversed(list(zip(path, path[1:]))):
+            if not node.count and len(node.children) <= 1:
+                if not node.children:
+                    del parent.children[node.label[0]]
+                    continue
+                # A word-less node with one child is merged into that child.
+                (child,) = node.children.values()
+                child.label = node.label + child.label
+                parent.children[child.label[0]] = child
+                node = child
+            node.best = max(
+                [node.count] + [child.best for child in node.children.values()])
+        self._root.best = max(
+            [0] + [child.best for child in self._root.children.values()])
+
+    def complete(self, prefix, limit):
+        """Returns up to `limit` words starting with prefix, most frequent
+        first, ties in alphabetical order. Words with a count of 0 are
+        skipped.
+        """
+        node = self._root
+        word = ""
+        rest = prefix
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                return []
+            common = _common_prefix_length(child.label, rest)
+            if common < min(len(child.label), len(rest)):
+                return []
+            word += child.label
+            node = child
+            rest = rest[common:]
+
+        completions = []
+        # (-count, word, 0, None) is a finished word,
+        # (-best, word, 1, node) is a subtree still to expand.
+        heap = [(-node.best, word, 1, node)] if node.best else []
+        while heap and len(completions) < limit:
+            _, word, is_subtree, node = heapq.heappop(heap)
+            if not is_subtree:
+                completions.append(word)
+                continue
+            if node.count:
+                heapq.heappush(heap, (-node.count, word, 0, None))
+            for child in node.children.values():
+                if child.best:
+                    heapq.heappush(
+                        heap, (-child.best, word + child.label, 1, child))
+        return completions
+
+
+def _words(video):
+    words = set(re.findall(r"\w+", video.title.lower()))
+    words.update(tag.lower() for tag in video.tags)
+    return words
+
+
+class Autocomplete(LibraryListener):
+    """Suggests title words and tags, counting only unflagged videos."""
+
+    def __init__(self):
+        self._tree = RadixTree()
+
+    def _add(self, video, delta):
+        for word in _words(video):
+            self._tree.add(word, delta)
+
+    def video_added(self, ordinal, video):
+        if not video.flag:
+            self._add(video, 1)
+
+    def video_removed(self, ordinal, video):
+        if not video.flag:
+            self._add(video, -1)
+
+    def video_flag_changed(self, ordinal, video):
+        self._add(video, -1 if video.flag else 1)
+
+    def complete(self, prefix, limit):
+        """Returns up to `limit` completions of a lowercased prefix, those
+        found in the most unflagged videos first.
+        """
+        return self._tree.complete(prefix, limit)
@@ -0,0 +1,104 @@
+"""Answering many title and tag searches in one pass over a library."""
+
+from collections import deque
+from typing import NamedTuple
+
+
+class AhoCorasick:
+    """A class used to find many substrings of a text at once.
+
+    The patterns are compiled into one automaton, so a text is scanned once
+    however many patterns there are.
+    """
+
+    def __init__(self, patterns):
+        # State 0 is the root. For each state: its transitions, its failure
+        # link and the patterns that end there (including via failures).
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for pattern in set(patterns):
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = self._goto[state][char] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = (
+                    self._output[next_state]
+                    + self._output[self._fail[next_state]])
+
+    def matches(self, text):
+        """Returns the set of patterns occurring in text."""
+        found = set(self._output[0])
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._output[state])
+        return found
+
+
+class BatchResult(NamedTuple):
+    """The matches of a batch search, by search term and by tag."""
+    titles: dict
+    tags: dict
+
+
+def batch_search(videos, terms=(), tags=()):
+    """Runs many title and tag searches in one pass over some videos.
+
+    Matching is case insensitive and skips flagged videos, like the single
+    searches. Title terms are matched with one Aho-Corasick automaton and
+    tags with one set lookup per video tag.
+
+    Args:
+        videos: The videos to search, in catalog order.
+        terms: Search terms to look for in titles.
+        tags: Tags to look for.
+
+    Returns:
+        A BatchResult mapping each term and each tag, as given, to the list
+        of matching videos in catalog order.
+    """
+    term_keys = {}
+    for term in terms:
+        term_keys.setdefault(term.lower(), []).append(term)
+    tag_keys = {}
+    for tag in tags:
+        tag_keys.setdefault(tag.lower(), []).append(tag)
+    automaton = AhoCorasick(term_keys)
+
+    result = BatchResult({term: [] for term in terms},
+                         {tag: [] for tag in tags})
+    for video in videos:
+        if video.flag:
+            continue
+        if term_keys:
+            for found in automaton.matches(video.title.lower()):
+                for term in term_keys[found]:
+                    result.titles[term].append(video)
+        for tag in {tag.lower() for tag in video.tags}:
+            for original in tag_keys.get(tag, ()):
+                result.tags[original].append(video)
+    return result
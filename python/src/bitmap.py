@@ -0,0 +1,240 @@
+"""A compressed bitmap of non-negative integers."""
+
+from bisect import bisect_left
+
+# Each container covers 2**16 consecutive values. As in Roaring bitmaps, a
+# container holding at most _ARRAY_MAX values is a sorted list of their low
+# bits, and a denser one is a _Bitset of 2**16 bits. Containers with no
+# values are not stored at all.
+_CONTAINER_BITS = 16
+_LOW_MASK = (1 << _CONTAINER_BITS) - 1
+_ARRAY_MAX = 4096
+_BITSET_BYTES = (1 << _CONTAINER_BITS) // 8
+
+
+class _Bitset:
+    """The bits of a dense container, changed in place, and how many are
+    set.
+    """
+
+    __slots__ = ("bits", "count")
+
+    def __init__(self, bits, count):
+        self.bits = bits
+        self.count = count
+
+    @classmethod
+    def from_int(cls, word, count):
+        return cls(bytearray(word.to_bytes(_BITSET_BYTES, "little")), count)
+
+    def to_int(self):
+        return int.from_bytes(self.bits, "little")
+
+    def __contains__(self, low):
+        return bool(self.bits[low >> 3] >> (low & 7) & 1)
+
+    def __eq__(self, other):
+        return isinstance(other, _Bitset) and self.bits == other.bits
+
+
+def _lows(bits):
+    """Yields the positions of the bits set in a little-endian byte string,
+    in ascending order.
+    """
+    for index, byte in enumerate(bits):
+        if byte:
+            base = index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+def _from_int(word):
+    """Returns the container holding the bits of word, None if empty."""
+    count = bin(word).count("1")
+    if not count:
+        return None
+    if count <= _ARRAY_MAX:
+        return list(_lows(word.to_bytes(_BITSET_BYTES, "little")))
+    return _Bitset.from_int(word, count)
+
+
+def _from_sorted(values):
+    """Returns the container holding sorted, distinct low values."""
+    if not values:
+        return None
+    if len(values) <= _ARRAY_MAX:
+        return values
+    word = 0
+    for low in values:
+        word |= 1 << low
+    return _Bitset.from_int(word, len(values))
+
+
+def _to_int(container):
+    if isinstance(container, _Bitset):
+        return container.to_int()
+    word = 0
+    for low in container:
+        word |= 1 << low
+    return word
+
+
+def _copy(container):
+    if isinstance(container, _Bitset):
+        return _Bitset(bytearray(container.bits), container.count)
+    return list(container)
+
+
+def _and(first, second):
+    if isinstance(first, list):
+        return _from_sorted([low for low in first if low in second])
+    if isinstance(second, list):
+        return _from_sorted([low for low in second if low in first])
+    return _from_int(first.to_int() & second.to_int())
+
+
+def _or(first, second):
+    if isinstance(first, list) and isinstance(second, list):
+        return _from_sorted(sorted(set(first).union(second)))
+    return _from_int(_to_int(first) | _to_int(second))
+
+
+def _sub(first, second):
+    if isinstance(first, list):
+        return _from_sorted([low for low in first if low not in second])
+    return _from_int(first.to_int() & ~_to_int(second))
+
+
+class Bitmap:
+    """A class used to represent a set of small non-negative integers.
+
+    Values are split into containers by their high bits, and only non-empty
+    containers are kept. A sparse container is a short sorted list, so a
+    rare tag costs a few bytes per video, while a dense one is a fixed-size
+    bitset, so set operations on dense ranges run a whole container at a
+    time.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, values=()):
+        self._containers = {}
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def _from_containers(cls, containers):
+        bitmap = cls()
+        bitmap._containers = containers
+        return bitmap
+
+    def add(self, value):
+        key, low = value >> _CONTAINER_BITS, value & _LOW_MASK
+        container = self._containers.get(key)
+        if container is None:
+            self._containers[key] = [low]
+        elif isinstance(container, _Bitset):
+            byte, bit = low >> 3, 1 << (low & 7)
+            if not container.bits[byte] & bit:
+                container.bits[byte] |= bit
+                container.count += 1
+        else:
+            position = bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                container.insert(position, low)
+                if len(container) > _ARRAY_MAX:
+                    self._containers[key] = _from_sorted(container)
+
+    def discard(self, value):
+        key, low = value >> _CONTAINER_BITS, value & _LOW_MASK
+        container = self._containers.get(key)
+        if container is None:
+            return
+        if isinstance(container, _Bitset):
+            byte, bit = low >> 3, 1 << (low & 7)
+            if container.bits[byte] & bit:
+                container.bits[byte] &= ~bit
+                container.count -= 1
+                if container.count <= _ARRAY_MAX:
+                    self._containers[key] = list(_lows(container.bits))
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                del container[position]
+                if not container:
+                    del self._containers[key]
+
+    def copy(self):
+        return self._from_containers({
+            key: _copy(container)
+            for key, container in self._containers.items()})
+
+    def __contains__(self, value):
+        container = self._containers.get(value >> _CONTAINER_BITS)
+        if container is None:
+            return False
+        low = value & _LOW_MASK
+        if isinstance(container, _Bitset):
+            return low in container
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def _combine(self, other, operation, keys):
+        """Applies operation to the containers of both bitmaps under keys.
+
+        A container only one side has is copied when the operation keeps it
+        (for | and -), so results never share containers with their inputs.
+        """
+        containers = {}
+        for key in keys:
+            first = self._containers.get(key)
+            second = other._containers.get(key)
+            if first is None or second is None:
+                kept = first if second is None else second
+                if operation is _or or (operation is _sub and first is kept):
+                    containers[key] = _copy(kept)
+                continue
+            container = operation(first, second)
+            if container is not None:
+                containers[key] = container
+        return self._from_containers(containers)
+
+    def __and__(self, other):
+        if len(other._containers) < len(self._containers):
+            self, other = other, self
+        return self._combine(other, _and, list(self._containers))
+
+    def __or__(self, other):
+        keys = set(self._containers).union(other._containers)
+        return self._combine(other, _or, keys)
+
+    def __sub__(self, other):
+        return self._combine(other, _sub, list(self._containers))
+
+    def __iter__(self):
+        """Yields the values in ascending order."""
+        for key in sorted(self._containers):
+            base = key << _CONTAINER_BITS
+            container = self._containers[key]
+            if isinstance(container, _Bitset):
+                container = _lows(container.bits)
+            for low in container:
+                yield base + low
+
+    def __len__(self):
+        return sum(container.count if isinstance(container, _Bitset)
+                   else len(container)
+                   for container in self._containers.values())
+
+    def __bool__(self):
+        return bool(self._containers)
+
+    def __eq__(self, other):
+        # Containers are always in their canonical form, so equal sets have
+        # equal containers.
+        return (isinstance(other, Bitmap)
+                and self._containers == other._containers)
+
+    def __repr__(self):
+        return f"Bitmap({list(self)})"
@@ -0,0 +1,270 @@
+"""A precompiled binary snapshot of the video catalog.
+
+Parsing videos.txt means running the CSV reader and re-splitting every tag
+list each time a library is built. A snapshot stores the already parsed
+catalog as flat tables:
+
+    header   magic, format version, source mtime/size and sha256
+    strings  every distinct title, video_id and tag, stored once
+    tags     string ids of each video's tags, back to back
+    records  (title, video_id, first tag, tag count) per video
+
+The snapshot remembers which source file it was compiled from, so a caller
+can tell whether it is still current and recompile when it is not.
+
+Run ``python3 -m src.catalog_snapshot [videos.txt]`` to compile a snapshot
+ahead of time.
+"""
+
+from .video import Video
+from array import array
+from collections.abc import MutableMapping
+from pathlib import Path
+import hashlib
+import os
+import struct
+import sys
+
+
+MAGIC = b"YTVS"
+VERSION = 1
+
+# magic, version, source mtime_ns, source size, source sha256
+_HEADER = struct.Struct("<4sHQQ32s")
+# number of strings, tag references and records
+_COUNTS = struct.Struct("<III")
+_RECORD_FIELDS = 4
+
+
+def snapshot_path_for(source):
+    """Returns the default snapshot location for a catalog file."""
+    source = Path(source)
+    return source.with_name(source.name + ".snapshot")
+
+
+def _source_digest(source):
+    with open(source, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).digest()
+
+
+def _source_header(stat, digest):
+    return _HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size,
+                        digest)
+
+
+def source_fingerprint(source):
+    """Returns the snapshot header recording the current state of source.
+
+    Take the fingerprint before parsing the source and pass it to
+    compile_snapshot. If the file changes while it is being parsed, the
+    snapshot then records the old state and is recompiled on the next load,
+    instead of passing the new content off as what was parsed.
+    """
+    stat = os.stat(source)
+    return _source_header(stat, _source_digest(source))
+
+
+def _to_bytes(values):
+    # Tables are stored little-endian whatever the host byte order is.
+    table = array("I", values)
+    if sys.byteorder == "big":
+        table.byteswap()
+    return table.tobytes()
+
+
+def _from_bytes(data):
+    table = array("I")
+    table.frombytes(data)
+    if sys.byteorder == "big":
+        table.byteswap()
+    return table
+
+
+def compile_snapshot(videos, source, snapshot_path=None, fingerprint=None):
+    """Writes a snapshot of the given videos, compiled from source.
+
+    Args:
+        videos: The Video objects parsed from source, in catalog order.
+        source: The catalog file the videos were read from.
+        snapshot_path: Where to write the snapshot. Defaults to
+            snapshot_path_for(source).
+        fingerprint: The source_fingerprint(source) taken before the videos
+            were parsed. Defaults to the fingerprint of source as it is now.
+
+    Returns:
+        True if the snapshot was written, False if it could not be (e.g. the
+        directory is read-only), in which case there is no snapshot.
+    """
+    snapshot_path = Path(snapshot_path or snapshot_path_for(source))
+    string_ids = {}
+    tag_refs = []
+    records = []
+
+    def intern(value):
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(string_ids)
+        return string_id
+
+    for video in videos:
+        tags = [intern(tag) for tag in video.tags]
+        records.extend((intern(video.title), intern(video.video_id),
+                        len(tag_refs), len(tags)))
+        tag_refs.extend(tags)
+
+    encoded = [value.encode() for value in string_ids]
+    body = b"".join((
+        _COUNTS.pack(len(encoded), len(tag_refs),
+                     len(records) // _RECORD_FIELDS),
+        _to_bytes(len(value) for value in encoded),
+        b"".join(encoded),
+        _to_bytes(tag_refs),
+        _to_bytes(records),
+    ))
+
+    # Write next to the destination and rename, so a concurrent reader never
+    # sees a half written snapshot.
+    tmp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    try:
+        if fingerprint is None:
+            fingerprint = source_fingerprint(source)
+        with open(tmp_path, "wb") as snapshot_file:
+            snapshot_file.write(fingerprint)
+            snapshot_file.write(body)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+class SnapshotCatalog(MutableMapping):
+    """A video_id -> Video mapping over a loaded snapshot.
+
+    Video objects are built from their record on first lookup and cached.
+    Videos assigned after loading only live in that cache.
+    """
+
+    def __init__(self, strings, tag_refs, records):
+        self._strings = strings
+        self._tag_refs = tag_refs
+        self._records = records
+        self._index = {
+            strings[records[i + 1]]: i
+            for i in range(0, len(records), _RECORD_FIELDS)
+        }
+        self._videos = {}
+
+    def __getitem__(self, video_id):
+        video = self._videos.get(video_id)
+        if video is None:
+            i = self._index[video_id]
+            title, _, tag_start, tag_count = self._records[i:i + _RECORD_FIELDS]
+            tags = [self._strings[ref] for ref in
+                    self._tag_refs[tag_start:tag_start + tag_count]]
+            video = Video(self._strings[title], video_id, tags)
+            self._videos[video_id] = video
+        return video
+
+    def __setitem__(self, video_id, video):
+        self._videos[video_id] = video
+        if video_id not in self._index:
+            self._index[video_id] = None
+
+    def __delitem__(self, video_id):
+        del self._index[video_id]
+        self._videos.pop(video_id, None)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, video_id):
+        return video_id in self._index
+
+
+def load_snapshot(source, snapshot_path=None):
+    """Loads the snapshot compiled from source, if it is still current.
+
+    The snapshot is current if the source file's mtime and size are the ones
+    it was compiled from, or failing that, if the source's sha256 still
+    matches (in which case the recorded mtime is refreshed).
+
+    Args:
+        source: The catalog file the snapshot should have been compiled from.
+        snapshot_path: Where the snapshot lives. Defaults to
+            snapshot_path_for(source).
+
+    Returns:
+        A SnapshotCatalog. None if there is no readable snapshot, it was
+        written by a different format version, it is truncated or corrupt,
+        or the source has changed since.
+    """
+    snapshot_path = Path(snapshot_path or snapshot_path_for(source))
+    try:
+        with open(snapshot_path, "rb") as snapshot_file:
+            data = snapshot_file.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size + _COUNTS.size:
+        return None
+
+    magic, version, mtime_ns, size, digest = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    stat = os.stat(source)
+    touched = (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size)
+    if touched and (stat.st_size != size
+                    or _source_digest(source) != digest):
+        return None
+
+    offset = _HEADER.size
+    n_strings, n_tag_refs, n_records = _COUNTS.unpack_from(data, offset)
+    offset += _COUNTS.size
+    if offset + 4 * n_strings > len(data):
+        return None
+    lengths = _from_bytes(data[offset:offset + 4 * n_strings])
+    offset += 4 * n_strings
+    # The sections must fill the rest of the file exactly, otherwise it was
+    # cut short (or has trailing garbage) and the tables cannot be trusted.
+    if (offset + sum(lengths) + 4 * n_tag_refs
+            + 4 * _RECORD_FIELDS * n_records != len(data)):
+        return None
+    strings = []
+    try:
+        for length in lengths:
+            strings.append(data[offset:offset + length].decode())
+            offset += length
+    except UnicodeDecodeError:
+        return None
+    tag_refs = _from_bytes(data[offset:offset + 4 * n_tag_refs])
+    offset += 4 * n_tag_refs
+    records = _from_bytes(
+        data[offset:offset + 4 * _RECORD_FIELDS * n_records])
+
+    if touched:
+        # Same content with a new mtime (e.g. a fresh checkout): remember the
+        # new mtime so the next load does not have to hash the file again.
+        # The snapshot is still good if that fails, it just gets hashed again.
+        try:
+            with open(snapshot_path, "r+b") as snapshot_file:
+                snapshot_file.write(_source_header(stat, digest))
+        except OSError:
+            pass
+    return SnapshotCatalog(strings, tag_refs, records)
+
+
+if __name__ == "__main__":
+    from .video_library import _DEFAULT_CATALOG, _load_catalog
+
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else _DEFAULT_CATALOG
+    fingerprint = source_fingerprint(source)
+    videos = _load_catalog(source)
+    if not compile_snapshot(videos.values(), source, fingerprint=fingerprint):
+        sys.exit(f"Could not write {snapshot_path_for(source)}")
+    print(f"Compiled {len(videos)} videos into {snapshot_path_for(source)}")
@@ -1,7 +1,8 @@
 """A command parser class."""
 
+from .output import flush_output
 import textwrap
-from typing import Sequence
+from typing import Callable, NamedTuple, Optional, Sequence
 
 
 class CommandException(Exception):
@@ -9,12 +10,144 @@ class CommandException(Exception):
     pass
 
 
+class Command(NamedTuple):
+    """A command the parser can run, and how many arguments it takes."""
+    handler: Callable
+    min_args: int
+    max_args: Optional[int]
+    usage: str
+
+
+def _no_arguments(handler):
+    """Wraps a handler that takes no arguments so any given are ignored."""
+    return lambda *ignored: handler()
+
+
 class CommandParser:
-    """A class used to parse and execute a user Command."""
+    """A class used to parse and execute a user Command.
 
-    def __init__(self, video_player):
-        self._player = video_player
+    Commands are kept in a registry keyed by their upper case name, so
+    running one is a single dict lookup however many commands there are.
+    """
 
+    def __init__(self, video_player, output=None):
+        """
+        Args:
+            video_player: The VideoPlayer the commands control.
+            output: The OutputSink to write to. Defaults to the player's.
+        """
+        self._player = video_player
+        self.output = output or video_player.output
+        self._commands = {}
+        self._help_lines = {}
+
+        player = video_player
+        self.register_command(
+            "NUMBER_OF_VIDEOS", _no_arguments(player.number_of_videos))
+        self.register_command("SHOW_ALL_VIDEOS", self._show_all_videos)
+        self.register_command(
+            "PLAY", player.play_video, 1, 1,
+            "Please enter PLAY command followed by video_id.")
+        self.register_command(
+            "PLAY_RANDOM", _no_arguments(player.play_random_video))
+        self.register_command("SHUFFLE", _no_arguments(player.shuffle_videos))
+        self.register_command("NEXT", _no_arguments(player.next_video))
+        self.register_command("STOP", _no_arguments(player.stop_video))
+        self.register_command("PAUSE", _no_arguments(player.pause_video))
+        self.register_command("CONTINUE", _no_arguments(player.continue_video))
+        self.register_command(
+            "SHOW_PLAYING", _no_arguments(player.show_playing))
+        self.register_command(
+            "CREATE_PLAYLIST", player.create_playlist, 1, 1,
+            "Please enter CREATE_PLAYLIST command followed by a "
+            "playlist name.")
+        self.register_command(
+            "ADD_TO_PLAYLIST", player.add_to_playlist, 2, 2,
+            "Please enter ADD_TO_PLAYLIST command followed by a "
+            "playlist name and video_id to add.")
+        self.register_command(
+            "REMOVE_FROM_PLAYLIST", player.remove_from_playlist, 2, 2,
+            "Please enter REMOVE_FROM_PLAYLIST command followed by a "
+            "playlist name and video_id to remove.")
+        self.register_command(
+            "CLEAR_PLAYLIST", player.clear_playlist, 1, 1,
+            "Please enter CLEAR_PLAYLIST command followed by a "
+            "playlist name.")
+        self.register_command(
+            "DELETE_PLAYLIST", player.delete_playlist, 1, 1,
+            "Please enter DELETE_PLAYLIST command followed by a "
+            "playlist name.")
+        self.register_command(
+            "SHOW_PLAYLIST", self._show_playlist, 1, None,
+            "Please enter SHOW_PLAYLIST command followed by a "
+            "playlist name.")
+        self.register_command(
+            "PLAYLISTS_CONTAINING", player.show_playlists_containing, 1, 1,
+            "Please enter PLAYLISTS_CONTAINING command followed by a "
+            "video_id.")
+        self.register_command(
+            "SHOW_ALL_PLAYLISTS", _no_arguments(player.show_all_playlists))
+        self.register_command(
+            "SEARCH_VIDEOS", player.search_videos, 1, 1,
+            "Please enter SEARCH_VIDEOS command followed by a "
+            "search term.")
+        self.register_command(
+            "SEARCH_VIDEOS_WITH_TAG", player.search_videos_tag, 1, 1,
+            "Please enter SEARCH_VIDEOS_WITH_TAG command followed by a "
+            "video tag.")
+        self.register_command(
+            "SEARCH_FUZZY", player.search_fuzzy, 1, 1,
+            "Please enter SEARCH_FUZZY command followed by a "
+            "search term.")
+        self.register_command(
+            "AUTOCOMPLETE", player.autocomplete, 1, 1,
+            "Please enter AUTOCOMPLETE command followed by the "
+            "start of a word or tag.")
+        self.register_command(
+            "SEARCH_TAGS", self._search_tags, 1, None,
+            "Please enter SEARCH_TAGS command followed by a "
+            "tag query.")
+        self.register_command(
+            "PLAY_RESULT", player.play_result, 1, 1,
+            "Please enter PLAY_RESULT command followed by the number "
+            "of a search result.")
+        self.register_command(
+            "FLAG_VIDEO", player.flag_video, 1, 2,
+            "Please enter FLAG_VIDEO command followed by a "
+            "video_id and an optional flag reason.")
+        self.register_command(
+            "ALLOW_VIDEO", player.allow_video, 1, 1,
+            "Please enter ALLOW_VIDEO command followed by a "
+            "video_id.")
+        self.register_command(
+            "RELOAD_LIBRARY", _no_arguments(player.reload_library))
+        self.register_command("HELP", _no_arguments(self._get_help))
+
+    def register_command(self, name, handler, min_args=0, max_args=None,
+                         usage=None, help_line=None):
+        """Adds a command, or replaces the one with the same name.
+
+        Args:
+            name: The command name, matched case insensitively.
+            handler: Called with the command's arguments as positional
+                arguments.
+            min_args: The fewest arguments the command takes.
+            max_args: The most arguments the command takes, None for no
+                limit.
+            usage: The message of the CommandException raised when the
+                number of arguments is wrong.
+            help_line: A line describing the command, listed by HELP after
+                the built-in commands.
+        """
+        name = name.upper()
+        usage = usage or f"Wrong number of arguments for {name} command."
+        self._commands[name] = Command(handler, min_args, max_args, usage)
+        # Replacing a command replaces (or drops) its HELP line too.
+        self._help_lines.pop(name, None)
+        if help_line:
+            self._help_lines[name] = help_line
+
+    @flush_output
     def execute_command(self, command: Sequence[str]):
         """Executes the user command. Expects the command to be upper case.
            Raises CommandException if a command cannot be parsed.
@@ -24,124 +157,70 @@ class CommandParser:
                 "Please enter a valid command, "
                 "type HELP for a list of available commands.")
 
-        if command[0].upper() == "NUMBER_OF_VIDEOS":
-            self._player.number_of_videos()
-
-        elif command[0].upper() == "SHOW_ALL_VIDEOS":
-            self._player.show_all_videos()
-
-        elif command[0].upper() == "PLAY":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter PLAY command followed by video_id.")
-            self._player.play_video(command[1])
-
-        elif command[0].upper() == "PLAY_RANDOM":
-            self._player.play_random_video()
-
-        elif command[0].upper() == "STOP":
-            self._player.stop_video()
-
-        elif command[0].upper() == "PAUSE":
-            self._player.pause_video()
-
-        elif command[0].upper() == "CONTINUE":
-            self._player.continue_video()
-
-        elif command[0].upper() == "SHOW_PLAYING":
-            self._player.show_playing()
-
-        elif command[0].upper() == "CREATE_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter CREATE_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.create_playlist(command[1])
-
-        elif command[0].upper() == "ADD_TO_PLAYLIST":
-            if len(command) != 3:
-                raise CommandException(
-                    "Please enter ADD_TO_PLAYLIST command followed by a "
-                    "playlist name and video_id to add.")
-            self._player.add_to_playlist(command[1], command[2])
-
-        elif command[0].upper() == "REMOVE_FROM_PLAYLIST":
-            if len(command) != 3:
-                raise CommandException(
-                    "Please enter REMOVE_FROM_PLAYLIST command followed by a "
-                    "playlist name and video_id to remove.")
-            self._player.remove_from_playlist(command[1], command[2])
-
-        elif command[0].upper() == "CLEAR_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter CLEAR_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.clear_playlist(command[1])
-
-        elif command[0].upper() == "DELETE_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter DELETE_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.delete_playlist(command[1])
-
-        elif command[0].upper() == "SHOW_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SHOW_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.show_playlist(command[1])
-
-        elif command[0].upper() == "SHOW_ALL_PLAYLISTS":
-            self._player.show_all_playlists()
-
-        elif command[0].upper() == "SEARCH_VIDEOS":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SEARCH_VIDEOS command followed by a "
-                    "search term.")
-            self._player.search_videos(command[1])
-
-        elif command[0].upper() == "SEARCH_VIDEOS_WITH_TAG":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SEARCH_VIDEOS_WITH_TAG command followed by a "
-                    "video tag.")
-            self._player.search_videos_tag(command[1])
-
-        elif command[0].upper() == "FLAG_VIDEO":
-            if len(command) == 3:
-                self._player.flag_video(command[1], command[2])
-            elif len(command) == 2:
-                self._player.flag_video(command[1])
-            else:
-                raise CommandException(
-                    "Please enter FLAG_VIDEO command followed by a "
-                    "video_id and an optional flag reason.")
-
-        elif command[0].upper() == "ALLOW_VIDEO":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter ALLOW_VIDEO command followed by a "
-                    "video_id.")
-            self._player.allow_video(command[1])
-
-        elif command[0].upper() == "HELP":
-            self._get_help()
-        else:
-            print(
+        entry = self._commands.get(command[0].upper())
+        if entry is None:
+            self.output.print(
                 "Please enter a valid command, type HELP for a list of "
                 "available commands.")
+            return
+
+        arguments = command[1:]
+        if len(arguments) < entry.min_args or (
+                entry.max_args is not None
+                and len(arguments) > entry.max_args):
+            raise CommandException(entry.usage)
+        entry.handler(*arguments)
+
+    def _show_all_videos(self, *arguments):
+        self._player.show_all_videos(
+            *self._parse_paging("SHOW_ALL_VIDEOS", arguments))
+
+    def _show_playlist(self, playlist_name, *arguments):
+        self._player.show_playlist(
+            playlist_name, *self._parse_paging("SHOW_PLAYLIST", arguments))
+
+    def _search_tags(self, *words):
+        self._player.search_tags(" ".join(words))
+
+    def _parse_paging(self, command_name, arguments):
+        """Parses optional LIMIT <n>, OFFSET <n> and CURSOR <cursor> pairs.
+
+        Returns:
+            A (limit, offset, cursor) tuple, with limit and cursor None and
+            offset 0 when not given.
+        """
+        paging = {"LIMIT": None, "OFFSET": 0, "CURSOR": None}
+        if len(arguments) % 2:
+            arguments = list(arguments) + [None]
+        for keyword, value in zip(arguments[::2], arguments[1::2]):
+            keyword = keyword.upper()
+            if keyword not in paging or value is None:
+                break
+            if keyword == "CURSOR":
+                paging[keyword] = value
+                continue
+            try:
+                paging[keyword] = int(value)
+            except ValueError:
+                break
+            if paging[keyword] < (1 if keyword == "LIMIT" else 0):
+                break
+        else:
+            return paging["LIMIT"], paging["OFFSET"], paging["CURSOR"]
+        raise CommandException(
+            f"Please enter {command_name} command optionally followed by "
+            "LIMIT <count>, OFFSET <count> and CURSOR <cursor>.")
 
     def _get_help(self):
         """Displays all available commands to the user."""
         help_text = textwrap.dedent("""
         Available commands:
             NUMBER_OF_VIDEOS - Shows how many videos are in the library.
-            SHOW_ALL_VIDEOS - Lists all videos from the library.
+            SHOW_ALL_VIDEOS [LIMIT <count>] [OFFSET <count>] [CURSOR <cursor>] - Lists all videos from the library, a page at a time if a LIMIT is given.
             PLAY <video_id> - Plays specified video.
             PLAY_RANDOM - Plays a random video from the library.
+            SHUFFLE - Plays every video once in a random order, starting with the first.
+            NEXT - Plays the next video of the shuffle.
             STOP - Stop the current video.
             PAUSE - Pause the current video.
             CONTINUE - Resume the current paused video.
@@ -151,13 +230,22 @@ class CommandParser:
             REMOVE_FROM_PLAYLIST <playlist_name> <video_id> - Removes the specified video from the specified playlist
             CLEAR_PLAYLIST <playlist_name> - Removes all the videos from the playlist.
             DELETE_PLAYLIST <playlist_name> - Deletes the playlist.
-            SHOW_PLAYLIST <playlist_name> - List all the videos in this playlist.
+            SHOW_PLAYLIST <playlist_name> [LIMIT <count>] [OFFSET <count>] [CURSOR <cursor>] - List all the videos in this playlist, a page at a time if a LIMIT is given.
             SHOW_ALL_PLAYLISTS - Display all the available playlists.
+            PLAYLISTS_CONTAINING <video_id> - Display all the playlists the video has been added to.
             SEARCH_VIDEOS <search_term> - Display all the videos whose titles contain the search_term.
             SEARCH_VIDEOS_WITH_TAG <tag_name> -Display all videos whose tags contains the provided tag.
+            SEARCH_FUZZY <search_term> - Display the videos whose titles most resemble the search_term, allowing for typos.
+            AUTOCOMPLETE <prefix> - Suggests title words and tags that start with the prefix.
+            SEARCH_TAGS <tag_query> - Display all videos matching a tag query using AND, OR, NOT and parentheses, e.g. #cat AND #animal NOT #google.
+            PLAY_RESULT <number> - Plays the numbered result of the last search.
             FLAG_VIDEO <video_id> <flag_reason> - Mark a video as flagged.
             ALLOW_VIDEO <video_id> - Removes a flag from a video.
+            RELOAD_LIBRARY - Picks up changes to the video catalog, keeping playlists and flags.
             HELP - Displays help.
             EXIT - Terminates the program execution.
         """)
-        print(help_text)
+        if self._help_lines:
+            help_text += "More commands:\n" + "".join(
+                f"    {line}\n" for line in self._help_lines.values())
+        self.output.print(help_text)
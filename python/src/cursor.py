@@ -0,0 +1,38 @@
+"""Opaque cursors for paging through results."""
+
+import base64
+import json
+
+
+def encode_cursor(*values):
+    """Packs JSON-serializable values into an opaque, URL-safe string."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _is_a(value, value_type):
+    # JSON has no separate bool, but True must not pass for a position.
+    if isinstance(value, bool):
+        return value_type is bool or value_type is object
+    if value_type is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, value_type)
+
+
+def decode_cursor(cursor, *types):
+    """Unpacks a cursor made by encode_cursor.
+
+    Args:
+        cursor: The cursor.
+        types: The type of each value the cursor must hold, in order.
+
+    Raises:
+        ValueError: If the cursor is malformed or holds other values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if (not isinstance(values, list) or len(values) != len(types)
+            or not all(map(_is_a, values, types))):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,21 @@
+"""A base class for objects that follow changes to a VideoLibrary."""
+
+
+class LibraryListener:
+    """A class used to receive changes to the videos of a VideoLibrary.
+
+    Indexes over the library register themselves as listeners so they can be
+    kept up to date incrementally instead of being rebuilt. Every video has a
+    dense ordinal: its position in catalog order, which never changes while
+    the video stays in the library. A video whose title or tags change is
+    reported as removed (with its old details) and then added again.
+    """
+
+    def video_added(self, ordinal, video):
+        """Called after a video joins the library."""
+
+    def video_removed(self, ordinal, video):
+        """Called after a video leaves the library."""
+
+    def video_flag_changed(self, ordinal, video):
+        """Called after a video is flagged or allowed."""
@@ -0,0 +1,114 @@
+"""Output sinks the video player writes to."""
+
+from contextlib import contextmanager
+import functools
+import sys
+
+
+class OutputSink:
+    """A class used to represent where a player's output goes.
+
+    Text is buffered until flush() is called, so a command that prints many
+    lines reaches its destination in one write. Subclasses decide where
+    flushed text is sent.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+
+    def print(self, *values, sep=" ", end="\n"):
+        """Buffers values the way the built-in print would write them."""
+        self._buffer.append(sep.join(map(str, values)) + end)
+
+    def write(self, text):
+        """Buffers text as it is."""
+        self._buffer.append(text)
+
+    def flush(self):
+        """Sends all buffered text, if there is any."""
+        if self._buffer:
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            self._send(text)
+
+    @contextmanager
+    def command(self):
+        """Flushes when the outermost of any nested commands ends.
+
+        Commands often run other commands, e.g. playing a video first stops
+        the current one, and their output should still go out in one write.
+        """
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.flush()
+
+    def _send(self, text):
+        raise NotImplementedError
+
+
+class StdoutSink(OutputSink):
+    """A class used to write output to standard output.
+
+    sys.stdout is looked up on every flush, so output still goes wherever
+    it has been redirected to since the sink was made.
+    """
+
+    def _send(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class MemorySink(OutputSink):
+    """A class used to collect output in memory, e.g. to return it to a
+    caller instead of showing it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._flushed = []
+
+    def _send(self, text):
+        self._flushed.append(text)
+
+    def getvalue(self):
+        """Returns all text flushed so far."""
+        return "".join(self._flushed)
+
+    def clear(self):
+        """Forgets the text flushed so far."""
+        self._flushed.clear()
+
+
+class SocketSink(OutputSink):
+    """A class used to send output over a connected socket."""
+
+    def __init__(self, connection, encoding="utf-8"):
+        """
+        Args:
+            connection: A connected socket.
+            encoding: How text is encoded before it is sent.
+        """
+        super().__init__()
+        self._connection = connection
+        self._encoding = encoding
+
+    def _send(self, text):
+        self._connection.sendall(text.encode(self._encoding))
+
+
+def flush_output(method):
+    """Makes a method run as a command of its object's `output` sink.
+
+    Used on every command, so a command's output is written once at the
+    end instead of line by line, even when it runs other commands.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.output.command():
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,54 @@
+"""The pool of videos PLAY_RANDOM can pick from."""
+
+from .library_listener import LibraryListener
+import random
+
+
+class PlayablePool(LibraryListener):
+    """A class used to keep the ordinals of all unflagged videos.
+
+    The ordinals are kept in a flat list with a position index, so a video
+    is added by appending it and removed by moving the last ordinal into
+    its slot. Picking a random playable video is then a single list index,
+    however large the catalog is.
+    """
+
+    def __init__(self):
+        self._ordinals = []
+        self._positions = {}
+
+    def _add(self, ordinal):
+        if ordinal not in self._positions:
+            self._positions[ordinal] = len(self._ordinals)
+            self._ordinals.append(ordinal)
+
+    def _remove(self, ordinal):
+        position = self._positions.pop(ordinal, None)
+        if position is None:
+            return
+        last = self._ordinals.pop()
+        if last != ordinal:
+            self._ordinals[position] = last
+            self._positions[last] = position
+
+    def video_added(self, ordinal, video):
+        if not video.flag:
+            self._add(ordinal)
+
+    def video_removed(self, ordinal, video):
+        self._remove(ordinal)
+
+    def video_flag_changed(self, ordinal, video):
+        if video.flag:
+            self._remove(ordinal)
+        else:
+            self._add(ordinal)
+
+    def choice(self):
+        """Returns a random playable ordinal, None if there are none."""
+        if not self._ordinals:
+            return None
+        return random.choice(self._ordinals)
+
+    def __len__(self):
+        return len(self._ordinals)
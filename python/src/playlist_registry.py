@@ -0,0 +1,140 @@
+"""A registry of playlists addressed by case-insensitive name."""
+
+from .video_playlist import Playlist
+from bisect import bisect_left, insort
+
+
+class PlaylistRegistry:
+    """A class used to hold all playlists of a player.
+
+    Playlists are stored under their case-folded name, so lookups ignore
+    case in O(1), while each Playlist keeps the name it was created with for
+    display. The case-folded names are also kept sorted, so the playlists
+    can be listed in order without sorting them every time. As in
+    TitleIndex, the names are split into sorted blocks of at most 2 * load
+    names with the largest of each block in a separate list, so creating or
+    deleting a playlist only shifts the names of one block, however many
+    playlists there are.
+
+    Videos should be added to and removed from playlists through the
+    registry, which keeps a reverse index from each video_id to the
+    playlists containing it.
+    """
+
+    def __init__(self, load=1000):
+        self._playlists = {}
+        self._load = load
+        self._blocks = []
+        self._maxes = []
+        # video_id -> {playlist key: None}, a set that keeps insertion order
+        self._containing = {}
+
+    @staticmethod
+    def _key(playlist_name):
+        return playlist_name.casefold()
+
+    def exists(self, playlist_name):
+        """Returns whether a playlist with this name, in any case, exists."""
+        return self._key(playlist_name) in self._playlists
+
+    def get(self, playlist_name):
+        """Returns the playlist with this name in any case, None if none."""
+        return self._playlists.get(self._key(playlist_name))
+
+    def create(self, playlist_name):
+        """Creates an empty playlist.
+
+        Returns:
+            The new Playlist. None if a playlist with the same name already
+            exists.
+        """
+        key = self._key(playlist_name)
+        if key in self._playlists:
+            return None
+        playlist = self._playlists[key] = Playlist(playlist_name)
+        self._insert_key(key)
+        return playlist
+
+    def _insert_key(self, key):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            return
+        position = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[position]
+        insort(block, key)
+        self._maxes[position] = block[-1]
+        if len(block) > 2 * self._load:
+            self._blocks.insert(position + 1, block[self._load:])
+            self._maxes.insert(position + 1, block[-1])
+            del block[self._load:]
+            self._maxes[position] = block[-1]
+
+    def _remove_key(self, key):
+        position = bisect_left(self._maxes, key)
+        block = self._blocks[position]
+        del block[bisect_left(block, key)]
+        if block:
+            self._maxes[position] = block[-1]
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+
+    def delete(self, playlist_name):
+        """Deletes a playlist.
+
+        Returns:
+            The deleted Playlist. None if it did not exist.
+        """
+        key = self._key(playlist_name)
+        playlist = self._playlists.pop(key, None)
+        if playlist is not None:
+            self._remove_key(key)
+            self._forget(key, playlist.get_all_videos())
+        return playlist
+
+    def _forget(self, key, videos):
+        for video in videos:
+            containing = self._containing[video.video_id]
+            del containing[key]
+            if not containing:
+                del self._containing[video.video_id]
+
+    def add_video(self, playlist, video):
+        """Appends a video to a playlist of this registry."""
+        playlist.add_video(video)
+        key = self._key(playlist.get_orginal_name())
+        self._containing.setdefault(video.video_id, {})[key] = None
+
+    def remove_video(self, playlist, video_id):
+        """Removes a video from a playlist of this registry.
+
+        Returns:
+            The removed Video. None if it was not in the playlist.
+        """
+        video = playlist.delete_video(video_id)
+        if video is not None:
+            self._forget(self._key(playlist.get_orginal_name()), [video])
+        return video
+
+    def clear(self, playlist):
+        """Removes all videos from a playlist of this registry."""
+        self._forget(self._key(playlist.get_orginal_name()),
+                     playlist.get_all_videos())
+        playlist.delete_all_vids()
+
+    def playlists_containing(self, video_id):
+        """Returns the playlists containing a video, in the order the video
+        was added to them.
+        """
+        return [self._playlists[key]
+                for key in self._containing.get(video_id, ())]
+
+    def __iter__(self):
+        """Yields the playlists sorted by case-folded name."""
+        for block in self._blocks:
+            for key in block:
+                yield self._playlists[key]
+
+    def __len__(self):
+        return len(self._playlists)
@@ -0,0 +1,97 @@
+"""A cache of search results that is invalidated as the library changes."""
+
+from .library_listener import LibraryListener
+from collections import OrderedDict
+import time
+
+
+TITLE = "title"
+TAG = "tag"
+
+
+class SearchCache(LibraryListener):
+    """A class used to cache title and tag search results.
+
+    Entries are evicted least recently used first once the cache is full,
+    and optionally expire after a time to live. As a library listener, the
+    cache drops exactly the entries a change can affect: when a video is
+    flagged, allowed, added, removed or edited, the cached title searches
+    whose term is in its title and the cached tag searches for its tags.
+
+    Attributes:
+        hits: The number of lookups answered from the cache.
+        misses: The number of lookups that were not.
+    """
+
+    def __init__(self, capacity=1024, ttl=None, clock=time.monotonic):
+        """The SearchCache class is initialized.
+
+        Args:
+            capacity: The maximum number of cached searches.
+            ttl: Seconds an entry stays valid, or None to keep it until it
+                is evicted or invalidated.
+            clock: Returns the current time in seconds.
+        """
+        self._entries = OrderedDict()
+        self._capacity = capacity
+        self._ttl = ttl
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, query):
+        """Returns the cached result of a search, None if there is none.
+
+        Args:
+            kind: TITLE or TAG.
+            query: The normalized (lowercased) search term or tag.
+        """
+        key = (kind, query)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, result = entry
+            if expires is None or expires > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, kind, query, result):
+        """Caches the result of a search.
+
+        Args:
+            kind: TITLE or TAG.
+            query: The normalized (lowercased) search term or tag.
+            result: The result to cache.
+        """
+        expires = None if self._ttl is None else self._clock() + self._ttl
+        key = (kind, query)
+        self._entries[key] = (expires, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _invalidate(self, video):
+        title = video.title.lower()
+        stale = [key for key in self._entries
+                 if key[0] == TITLE and key[1] in title]
+        stale.extend((TAG, tag.lower()) for tag in video.tags)
+        for key in stale:
+            self._entries.pop(key, None)
+
+    def video_added(self, ordinal, video):
+        self._invalidate(video)
+
+    def video_removed(self, ordinal, video):
+        self._invalidate(video)
+
+    def video_flag_changed(self, ordinal, video):
+        self._invalidate(video)
@@ -0,0 +1,179 @@
+"""Indexes used to search the videos of a VideoLibrary."""
+
+from .bitmap import Bitmap
+from .library_listener import LibraryListener
+from collections import defaultdict
+import itertools
+import math
+import re
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(LibraryListener):
+    """An inverted index from each trigram of a lowercased title to videos.
+
+    Every title containing a search term also contains all of the term's
+    trigrams, so intersecting their posting sets narrows the search down to
+    a few candidates, which the caller then verifies. Flag state is not
+    indexed; the caller skips flagged videos while verifying.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+
+    def video_added(self, ordinal, video):
+        for trigram in _trigrams(video.title.lower()):
+            self._postings[trigram].add(ordinal)
+
+    def video_removed(self, ordinal, video):
+        for trigram in _trigrams(video.title.lower()):
+            posting = self._postings[trigram]
+            posting.discard(ordinal)
+            if not posting:
+                del self._postings[trigram]
+
+    def candidates(self, term):
+        """Yields, in no particular order, the ordinals that may match term.
+
+        Args:
+            term: A lowercased search term.
+
+        Returns:
+            An iterator over candidate ordinals, or None if the term is too
+            short to have trigrams and every video is a candidate.
+        """
+        trigrams = _trigrams(term)
+        if not trigrams:
+            return None
+        postings = sorted(
+            (self._postings.get(trigram, ()) for trigram in trigrams), key=len)
+        smallest, rest = postings[0], postings[1:]
+        # Walk the rarest trigram's posting rather than building the full
+        # intersection.
+        return (ordinal for ordinal in smallest
+                if all(ordinal in posting for posting in rest))
+
+
+class TagIndex(LibraryListener):
+    """An inverted index from each lowercased tag to the videos carrying it.
+
+    Postings are Bitmaps of ordinals, so tag queries are answered with set
+    operations. The index also keeps Bitmaps of all videos and of the flagged
+    ones, so flagged videos can be subtracted from any result.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self.videos = Bitmap()
+        self.flagged = Bitmap()
+
+    def video_added(self, ordinal, video):
+        self.videos.add(ordinal)
+        for tag in {tag.lower() for tag in video.tags}:
+            self._postings.setdefault(tag, Bitmap()).add(ordinal)
+        if video.flag:
+            self.flagged.add(ordinal)
+
+    def video_removed(self, ordinal, video):
+        self.videos.discard(ordinal)
+        self.flagged.discard(ordinal)
+        # Tags equal once lowercased share one posting.
+        for tag in {tag.lower() for tag in video.tags}:
+            posting = self._postings[tag]
+            posting.discard(ordinal)
+            if not posting:
+                del self._postings[tag]
+
+    def video_flag_changed(self, ordinal, video):
+        if video.flag:
+            self.flagged.add(ordinal)
+        else:
+            self.flagged.discard(ordinal)
+
+    def postings(self, tag):
+        """Returns the Bitmap of ordinals tagged with a lowercased tag."""
+        return self._postings.get(tag) or Bitmap()
+
+
+def _word_trigrams(text):
+    """Returns the trigram set of each distinct word of text, padded like
+    pg_trgm.
+
+    Padding each word with two leading spaces and one trailing space gives
+    short words trigrams too, and weights word starts, where typos are rare.
+    """
+    words = dict.fromkeys(re.findall(r"\w+", text.lower()))
+    return [frozenset(_trigrams(f"  {word} ")) for word in words]
+
+
+class FuzzyIndex(LibraryListener):
+    """A trigram similarity index over the words of the titles.
+
+    Like pg_trgm's word_similarity, each query word is compared with the
+    title word closest to it, by the share of the query word's trigrams the
+    two have in common. A misspelt word still shares most of its trigrams
+    with the word it was meant to be, however long the rest of the title.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._words = {}
+
+    def video_added(self, ordinal, video):
+        words = _word_trigrams(video.title)
+        self._words[ordinal] = words
+        for trigram in set().union(*words):
+            self._postings[trigram].add(ordinal)
+
+    def video_removed(self, ordinal, video):
+        for trigram in set().union(*self._words.pop(ordinal)):
+            posting = self._postings[trigram]
+            posting.discard(ordinal)
+            if not posting:
+                del self._postings[trigram]
+
+    def similar(self, search_term, threshold, max_candidates):
+        """Yields (similarity, ordinal) for titles similar to search_term.
+
+        The similarity is the number of trigrams each query word shares
+        with its closest title word, summed and divided by the number of
+        query word trigrams. A title reaching `threshold` must therefore
+        contain a good share of the query's trigrams, so it has to appear
+        in the postings of the rarest few. Only those postings are read, and
+        at most max_candidates of the ordinals found there are scored, which
+        bounds the work per query however large the catalog is.
+
+        Args:
+            search_term: The query.
+            threshold: The minimum similarity, between 0 and 1.
+            max_candidates: The maximum number of titles to score.
+        """
+        query_words = _word_trigrams(search_term)
+        trigrams = set().union(*query_words)
+        if not trigrams:
+            return
+        total = sum(len(word) for word in query_words)
+        postings = sorted(
+            (self._postings.get(trigram, set()) for trigram in trigrams),
+            key=len)
+        # A trigram shared by several query words can count once for each.
+        min_shared = max(1, math.ceil(threshold * total / len(query_words)))
+
+        candidates = set()
+        for posting in postings[:max(1, len(trigrams) - min_shared + 1)]:
+            candidates.update(itertools.islice(
+                posting, max_candidates - len(candidates)))
+            if len(candidates) >= max_candidates:
+                break
+
+        for ordinal in candidates:
+            title_words = self._words[ordinal]
+            shared = sum(max(len(word & title_word)
+                             for title_word in title_words)
+                         for word in query_words)
+            similarity = shared / total
+            if similarity >= threshold:
+                yield similarity, ordinal
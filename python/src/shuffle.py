@@ -0,0 +1,53 @@
+"""A lazy pseudo-random permutation for shuffle play."""
+
+import random
+
+
+_ROUNDS = 4
+
+
+class LazyPermutation:
+    """A class used to walk range(size) in a pseudo-random order.
+
+    Each index is enciphered with a small Feistel network over the smallest
+    even number of bits that can hold size - 1. A Feistel network is a
+    bijection whatever its round function, so enciphering 0, 1, 2, ... gives
+    each value exactly once; values outside range(size) are enciphered again
+    until they fall inside it ("cycle walking"). Only the round keys are
+    stored, so a walk needs O(1) memory however large size is.
+    """
+
+    def __init__(self, size, seed=None):
+        """The LazyPermutation class is initialized.
+
+        Args:
+            size: The number of values to permute.
+            seed: Picks the permutation. A random one if None.
+        """
+        self._size = size
+        bits = max(2, (size - 1).bit_length())
+        self._half_bits = (bits + 1) // 2
+        self._mask = (1 << self._half_bits) - 1
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(32) for _ in range(_ROUNDS)]
+
+    def _round(self, value, key):
+        value = (value ^ key) * 0x9E3779B1 & 0xFFFFFFFF
+        value ^= value >> 15
+        return (value * 0x85EBCA6B >> 7) & self._mask
+
+    def _encipher(self, value):
+        left, right = value >> self._half_bits, value & self._mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return left << self._half_bits | right
+
+    def __iter__(self):
+        for index in range(self._size):
+            value = self._encipher(index)
+            while value >= self._size:
+                value = self._encipher(value)
+            yield value
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,183 @@
+"""A video library backed by a SQLite database."""
+
+from .video import Video
+from .video_library import VideoLibrary, _read_rows
+from collections.abc import MutableMapping
+from itertools import groupby
+import sqlite3
+import weakref
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    flag_reason TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS video_tags (
+    video_id TEXT NOT NULL REFERENCES videos (video_id),
+    position INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL REFERENCES tags (tag_id),
+    PRIMARY KEY (video_id, position)
+);
+CREATE INDEX IF NOT EXISTS video_tags_by_tag ON video_tags (tag_id);
+"""
+
+_VIDEO_TAGS = """
+SELECT tags.name FROM video_tags JOIN tags USING (tag_id)
+WHERE video_tags.video_id = ? ORDER BY video_tags.position
+"""
+
+_ALL_VIDEOS = """
+SELECT videos.video_id, videos.title, videos.flag_reason, tags.name
+FROM videos
+LEFT JOIN video_tags USING (video_id)
+LEFT JOIN tags USING (tag_id)
+ORDER BY videos.rowid, video_tags.position
+"""
+
+
+class _SqliteCatalog(MutableMapping):
+    """A video_id -> Video mapping stored in a SQLite database.
+
+    Videos keep catalog order through the table's rowid. A Video is only
+    cached while something else still references it, so memory stays bounded
+    by what the player is holding on to rather than by the catalog size, and
+    every holder of a video sees the same object.
+    """
+
+    def __init__(self, connection):
+        self._db = connection
+        self._db.executescript(_SCHEMA)
+        self._videos = weakref.WeakValueDictionary()
+
+    def _make_video(self, video_id, title, flag_reason, tags):
+        video = self._videos.get(video_id)
+        if video is None:
+            video = Video(title, video_id, tags)
+            if flag_reason is not None:
+                video.flag_video(flag_reason)
+            self._videos[video_id] = video
+        return video
+
+    def _write(self, video_id, title, tags):
+        updated = self._db.execute(
+            "UPDATE videos SET title = ? WHERE video_id = ?",
+            (title, video_id))
+        if not updated.rowcount:
+            self._db.execute(
+                "INSERT INTO videos (video_id, title) VALUES (?, ?)",
+                (video_id, title))
+        self._db.execute(
+            "DELETE FROM video_tags WHERE video_id = ?", (video_id,))
+        for position, tag in enumerate(tags):
+            self._db.execute(
+                "INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
+            self._db.execute(
+                "INSERT INTO video_tags (video_id, position, tag_id) "
+                "SELECT ?, ?, tag_id FROM tags WHERE name = ?",
+                (video_id, position, tag))
+
+    def import_rows(self, rows):
+        """Stores (title, url, tags) catalog rows in one transaction."""
+        with self._db:
+            for title, url, tags in rows:
+                self._write(url, title, tags)
+
+    def set_flag(self, video_id, flag_reason):
+        """Persists a video's flag reason, None meaning not flagged."""
+        with self._db:
+            self._db.execute(
+                "UPDATE videos SET flag_reason = ? WHERE video_id = ?",
+                (flag_reason, video_id))
+
+    def __getitem__(self, video_id):
+        video = self._videos.get(video_id)
+        if video is not None:
+            return video
+        row = self._db.execute(
+            "SELECT title, flag_reason FROM videos WHERE video_id = ?",
+            (video_id,)).fetchone()
+        if row is None:
+            raise KeyError(video_id)
+        tags = [name for (name,) in self._db.execute(_VIDEO_TAGS, (video_id,))]
+        return self._make_video(video_id, *row, tags)
+
+    def __setitem__(self, video_id, video):
+        with self._db:
+            self._write(video_id, video.title, video.tags)
+            self._db.execute(
+                "UPDATE videos SET flag_reason = ? WHERE video_id = ?",
+                (video.flag_reason if video.flag else None, video_id))
+        self._videos[video_id] = video
+
+    def __delitem__(self, video_id):
+        with self._db:
+            self._db.execute(
+                "DELETE FROM video_tags WHERE video_id = ?", (video_id,))
+            deleted = self._db.execute(
+                "DELETE FROM videos WHERE video_id = ?", (video_id,))
+        if not deleted.rowcount:
+            raise KeyError(video_id)
+        self._videos.pop(video_id, None)
+
+    def __contains__(self, video_id):
+        return self._db.execute(
+            "SELECT 1 FROM videos WHERE video_id = ?",
+            (video_id,)).fetchone() is not None
+
+    def __iter__(self):
+        for (video_id,) in self._db.execute(
+                "SELECT video_id FROM videos ORDER BY rowid"):
+            yield video_id
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def values(self):
+        """Streams every video in catalog order with a single query."""
+        rows = self._db.execute(_ALL_VIDEOS)
+        for (video_id, title, flag_reason), video_rows in groupby(
+                rows, key=lambda row: row[:3]):
+            tags = [tag for *_, tag in video_rows if tag is not None]
+            yield self._make_video(video_id, title, flag_reason, tags)
+
+
+class SqliteVideoLibrary(VideoLibrary):
+    """A Video Library stored in a SQLite database.
+
+    Lookups by video_id use the primary key index and tags live in a join
+    table, so catalogs larger than memory can be served, and several player
+    processes can share one database. Flags are written to the database as
+    soon as they change.
+    """
+
+    def __init__(self, database, video_file=None):
+        """The SqliteVideoLibrary class is initialized.
+
+        Args:
+            database: Path of the SQLite database file. It is created if it
+                does not exist yet.
+            video_file: Catalog file to import when the database is empty,
+                and to read on reload. Defaults to the bundled videos.txt.
+        """
+        self._database = database
+        super().__init__(video_file)
+
+    def _open_catalog(self, lazy, snapshot):
+        catalog = _SqliteCatalog(sqlite3.connect(self._database))
+        if not len(catalog):
+            catalog.import_rows(_read_rows(self._path, self._workers))
+        return catalog
+
+    def flag_video(self, video, reason):
+        super().flag_video(video, reason)
+        self._videos.set_flag(video.video_id, reason)
+
+    def allow_video(self, video):
+        super().allow_video(video)
+        self._videos.set_flag(video.video_id, None)
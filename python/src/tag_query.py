@@ -0,0 +1,108 @@
+"""A parser and evaluator for boolean tag queries.
+
+Queries combine tags with AND, OR and NOT, grouped with parentheses, e.g.
+``#cat AND (#animal OR #pet) NOT #google``. NOT binds tightest, then AND,
+then OR. Two operands next to each other are ANDed, so ``#cat NOT #google``
+reads as ``#cat AND NOT #google``. Tags and operators are case insensitive.
+"""
+
+import re
+
+
+_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+_OPERATORS = ("AND", "OR", "NOT")
+
+
+class TagQueryError(Exception):
+    """A class used to represent a malformed tag query."""
+    pass
+
+
+def _tokenize(expression):
+    tokens = []
+    for token in _TOKEN.findall(expression):
+        upper = token.upper()
+        tokens.append(upper if upper in _OPERATORS else token)
+    return tokens
+
+
+class _Parser:
+    """A recursive descent parser evaluating a query as it goes.
+
+    Args:
+        tokens: The tokens of the query.
+        tag_bitmap: Returns the Bitmap of videos carrying a lowercased tag.
+        universe: The Bitmap of all videos, used to evaluate NOT.
+    """
+
+    def __init__(self, tokens, tag_bitmap, universe):
+        self._tokens = tokens
+        self._position = 0
+        self._tag_bitmap = tag_bitmap
+        self._universe = universe
+
+    def _peek(self):
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise TagQueryError("Unexpected end of query")
+        self._position += 1
+        return token
+
+    def parse(self):
+        if not self._tokens:
+            raise TagQueryError("Query is empty")
+        result = self._expression()
+        if self._peek() is not None:
+            raise TagQueryError(f"Unexpected '{self._peek()}'")
+        return result
+
+    def _expression(self):
+        result = self._term()
+        while self._peek() == "OR":
+            self._next()
+            result = result | self._term()
+        return result
+
+    def _term(self):
+        result = self._factor()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+            result = result & self._factor()
+        return result
+
+    def _factor(self):
+        token = self._next()
+        if token == "NOT":
+            return self._universe - self._factor()
+        if token == "(":
+            result = self._expression()
+            if self._peek() != ")":
+                raise TagQueryError("Missing ')'")
+            self._next()
+            return result
+        if token in (")", "AND", "OR"):
+            raise TagQueryError(f"Unexpected '{token}'")
+        return self._tag_bitmap(token.lower())
+
+
+def evaluate(expression, tag_bitmap, universe):
+    """Evaluates a tag query.
+
+    Args:
+        expression: The query, e.g. "#cat AND #animal NOT #google".
+        tag_bitmap: Returns the Bitmap of videos carrying a lowercased tag.
+        universe: The Bitmap of all videos, used to evaluate NOT.
+
+    Returns:
+        The Bitmap of matching videos.
+
+    Raises:
+        TagQueryError: If the query cannot be parsed.
+    """
+    return _Parser(_tokenize(expression), tag_bitmap, universe).parse()
@@ -0,0 +1,91 @@
+"""An index keeping a library's videos sorted by title."""
+
+from .library_listener import LibraryListener
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+
+class TitleIndex(LibraryListener):
+    """A class used to keep the videos of a library in title order.
+
+    Each video is kept as a (title, ordinal) key, so ties between equal
+    titles fall back to catalog order. The keys are split into sorted
+    blocks of at most 2 * load keys, with the largest key of each block in
+    a separate list. Finding a key is a binary search over the block maxima
+    and then within one block, and inserting or removing one only shifts
+    the keys of its own block, however many videos there are.
+    """
+
+    def __init__(self, load=1000):
+        self._load = load
+        self._blocks = []
+        self._maxes = []
+        self._len = 0
+
+    def video_added(self, ordinal, video):
+        key = (video.title, ordinal)
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+        else:
+            position = min(bisect_left(self._maxes, key),
+                           len(self._blocks) - 1)
+            block = self._blocks[position]
+            insort(block, key)
+            self._maxes[position] = block[-1]
+            if len(block) > 2 * self._load:
+                self._blocks.insert(position + 1, block[self._load:])
+                self._maxes.insert(position + 1, block[-1])
+                del block[self._load:]
+                self._maxes[position] = block[-1]
+        self._len += 1
+
+    def video_removed(self, ordinal, video):
+        key = (video.title, ordinal)
+        position = bisect_left(self._maxes, key)
+        if position == len(self._blocks):
+            return
+        block = self._blocks[position]
+        index = bisect_left(block, key)
+        if block[index] != key:
+            return
+        del block[index]
+        if block:
+            self._maxes[position] = block[-1]
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+        self._len -= 1
+
+    def keys_after(self, key=None, offset=0):
+        """Yields the (title, ordinal) keys sorting after `key`, in order.
+
+        The key does not have to be in the index, so a walk can resume
+        after a video that has since been removed. Passing (title,) starts
+        at the first video with that title or a later one.
+
+        Args:
+            key: Where to start. From the first key if None.
+            offset: The number of keys to skip first. Whole blocks are
+                skipped without looking at their keys.
+        """
+        if key is None:
+            position, index = 0, 0
+        else:
+            key = tuple(key)
+            position = bisect_right(self._maxes, key)
+            index = 0
+            if position < len(self._blocks):
+                index = bisect_right(self._blocks[position], key)
+        index += offset
+        while (position < len(self._blocks)
+               and index >= len(self._blocks[position])):
+            index -= len(self._blocks[position])
+            position += 1
+
+        for block in islice(self._blocks, position, None):
+            yield from islice(block, index, None)
+            index = 0
+
+    def __len__(self):
+        return self._len
@@ -1,11 +1,40 @@
 """A video class."""
 
 from typing import Sequence
+import sys
+import weakref
+
+
+# Shared tag vocabulary: every distinct tag string and every distinct tag
+# tuple is stored once, however many videos carry it. Tuples cannot be
+# weakly referenced, so each is held by a _SharedTags that videos point at;
+# a combination no video uses any more drops out of the vocabulary.
+class _SharedTags:
+    __slots__ = ("tags", "__weakref__")
+
+    def __init__(self, tags):
+        self.tags = tags
+
+
+_TAG_TUPLES = weakref.WeakValueDictionary()
+
+
+def _intern_tags(video_tags: Sequence[str]):
+    tags = tuple(sys.intern(tag) for tag in video_tags)
+    shared = _TAG_TUPLES.get(tags)
+    if shared is None:
+        shared = _TAG_TUPLES[tags] = _SharedTags(tags)
+    return shared
 
 
 class Video:
     """A class used to represent a Video."""
 
+    # No per-instance __dict__; catalogs hold millions of these.
+    # __weakref__ lets backends cache videos only while they are in use.
+    __slots__ = ("_title", "_video_id", "_tags", "_flag_reason", "_details",
+                 "__weakref__")
+
     def __init__(self, video_title: str, video_id: str, video_tags: Sequence[str]):
         """Video constructor."""
         self._title = video_title
@@ -13,10 +42,14 @@ class Video:
 
         # Turn the tags into a tuple here so it's unmodifiable,
         # in case the caller changes the 'video_tags' they passed to us
-        self._tags = tuple(video_tags)
+        self._tags = _intern_tags(video_tags)
 
-        self._flag = False
-        self._flag_reason = ""
+        # None unless the video is flagged, so the flag and its reason share
+        # one slot.
+        self._flag_reason = None
+
+        # The listing line, rendered the first time it is needed.
+        self._details = None
 
     @property
     def title(self) -> str:
@@ -31,22 +64,43 @@ class Video:
     @property
     def tags(self) -> Sequence[str]:
         """Returns the list of tags of a video."""
-        return self._tags
+        return self._tags.tags
     
     @property
     def flag(self) -> bool:
         """Returns whether the video has been flagged or not"""
-        return self._flag
+        return self._flag_reason is not None
     
     @property
     def flag_reason(self) -> str:
         """Returns whether the reason for the video being flagged"""
-        return self._flag_reason
-    
+        return self._flag_reason or ""
+
+    @property
+    def details(self) -> str:
+        """Returns the line used to list the video, with its flag reason.
+
+        The line is built once and kept until the title, tags or flag
+        change, so listing many videos only joins prebuilt strings.
+        """
+        if self._details is None:
+            flag = ""
+            if self._flag_reason is not None:
+                flag = f"- FLAGGED (reason: {self.flag_reason})"
+            self._details = (f" {self._title} ({self._video_id}) "
+                             f"[{' '.join(self._tags.tags)}] {flag}")
+        return self._details
+
+    def update(self, video_title: str, video_tags: Sequence[str]):
+        """Replaces the title and tags, e.g. after a catalog reload."""
+        self._title = video_title
+        self._tags = _intern_tags(video_tags)
+        self._details = None
+
     def flag_video(self, reason):
-        self._flag = True
         self._flag_reason = reason
+        self._details = None
     
     def unflag_video(self):
-        self._flag = True
-        self._flag_reason = ""
\ No newline at end of file
+        self._flag_reason = None
+        self._details = None
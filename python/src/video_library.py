@@ -1,8 +1,41 @@
 """A video library class."""
 
+from . import catalog_snapshot
+from .autocomplete import Autocomplete
+from .cursor import decode_cursor, encode_cursor
+from .playable_pool import PlayablePool
+from .shuffle import LazyPermutation
+from . import tag_query
+from .search_index import FuzzyIndex, TagIndex, TrigramIndex
+from .title_index import TitleIndex
 from .video import Video
+from typing import NamedTuple
+from array import array
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 import csv
+import heapq
+import io
+import mmap
+import os
+
+
+_DEFAULT_CATALOG = Path(__file__).parent / "videos.txt"
+
+
+class CatalogChanges(NamedTuple):
+    """The videos added, removed and updated by a library reload.
+
+    On a lazily loaded library, removed and updated only list videos that
+    had been read before the reload: a row never parsed has no old details
+    to report or compare against.
+    """
+    added: list
+    removed: list
+    updated: list
 
 
 # Helper Wrapper around CSV reader to strip whitespace from around
@@ -11,28 +44,591 @@ def _csv_reader_with_strip(reader):
     yield from ((item.strip() for item in line) for line in reader)
 
 
-class VideoLibrary:
-    """A class used to represent a Video Library."""
+def _row_from_fields(video_info):
+    """Turns one stripped catalog line into a (title, url, tags) tuple."""
+    title, url, tags = video_info
+    return (
+        title,
+        url,
+        [tag.strip() for tag in tags.split(",")] if tags else [],
+    )
+
+
+class _MappedCatalog(MutableMapping):
+    """A video_id -> Video mapping over a memory-mapped catalog.
 
-    def __init__(self):
-        """The VideoLibrary class is initialized."""
+    Only a byte-offset index keyed by video_id is built up front; each Video
+    is parsed the first time it is looked up and cached from then on. As with
+    the eager loader, the last row wins if a video_id appears more than once.
+    """
+
+    def __init__(self, path):
         self._videos = {}
-        with open(Path(__file__).parent / "videos.txt") as video_file:
+        self._map = b""
+        self._offsets = self._map_file(path)
+
+    def _map_file(self, path):
+        """Maps the catalog file and returns its video_id -> offsets index."""
+        offsets = {}
+        with open(path, "rb") as video_file:
+            # mmap refuses to map an empty file.
+            if not video_file.seek(0, 2):
+                self._map = b""
+                return offsets
+            self._map = mmap.mmap(
+                video_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._map)
+        start = 0
+        while start < size:
+            end = self._map.find(b"\n", start)
+            if end == -1:
+                end = size
+            fields = self._map[start:end].split(b"|", 2)
+            if len(fields) > 1:
+                video_id = fields[1].strip().decode()
+                offsets[video_id] = (start, end)
+            start = end + 1
+        return offsets
+
+    def built(self, video_id):
+        """Returns the Video if it has been built, None otherwise."""
+        return self._videos.get(video_id)
+
+    def remap(self, path):
+        """Maps the catalog file again after it has changed on disk.
+
+        The old offsets point into bytes that may have been overwritten, so
+        no row is ever read through them again. Only the videos already in
+        the catalog are kept; new rows are left for the caller to add.
+        Videos already built are kept even if they are no longer in the
+        file, so the caller can still compare and remove them. Videos never
+        built that are no longer in the file have no details left to read
+        and are dropped.
+
+        Returns:
+            The ids of the videos dropped that way.
+        """
+        old_map = self._map
+        offsets = self._map_file(path)
+        if isinstance(old_map, mmap.mmap):
+            old_map.close()
+
+        dropped = []
+        for video_id in self._offsets:
+            if video_id in offsets:
+                self._offsets[video_id] = offsets[video_id]
+            elif video_id in self._videos:
+                self._offsets[video_id] = None
+            else:
+                dropped.append(video_id)
+        for video_id in dropped:
+            del self._offsets[video_id]
+        return dropped
+
+    def __getitem__(self, video_id):
+        video = self._videos.get(video_id)
+        if video is None:
+            start, end = self._offsets[video_id]
+            line = self._map[start:end].decode()
             reader = _csv_reader_with_strip(
-                csv.reader(video_file, delimiter="|"))
-            for video_info in reader:
-                title, url, tags = video_info
-                self._videos[url] = Video(
-                    title,
-                    url,
-                    [tag.strip() for tag in tags.split(",")] if tags else [],
-                )
+                csv.reader([line], delimiter="|"))
+            video = Video(*_row_from_fields(next(reader)))
+            self._videos[video_id] = video
+        return video
+
+    def __setitem__(self, video_id, video):
+        self._videos[video_id] = video
+        if video_id not in self._offsets:
+            # Added after loading, so it only lives in the cache.
+            self._offsets[video_id] = None
+
+    def __delitem__(self, video_id):
+        del self._offsets[video_id]
+        self._videos.pop(video_id, None)
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __contains__(self, video_id):
+        return video_id in self._offsets
+
+
+def _parse_rows(path):
+    """Yields a (title, url, tags) tuple for every line of a catalog file."""
+    with open(path) as video_file:
+        reader = _csv_reader_with_strip(
+            csv.reader(video_file, delimiter="|"))
+        for video_info in reader:
+            yield _row_from_fields(video_info)
+
+
+def _chunk_boundaries(path, chunks):
+    """Splits a file into at most `chunks` byte ranges on line boundaries."""
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as video_file:
+        for i in range(1, chunks):
+            video_file.seek(max(size * i // chunks, boundaries[-1]))
+            video_file.readline()
+            position = video_file.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+# Separates the fields of a parsed chunk. The csv module never yields it
+# inside a field of a text catalog.
+_FIELD_SEPARATOR = "\0"
+
+
+def _parse_chunk(path, start, end):
+    """Parses the catalog lines in bytes [start, end) of a catalog file.
+
+    Runs in a worker process. Instead of a list of tuples, which the parent
+    would have to unpickle object by object, it returns two flat values:
+    every field (title, url, then the tags of each row) joined into one
+    string, and an array with the number of tags of each row.
+    """
+    with open(path, "rb") as video_file:
+        video_file.seek(start)
+        text = video_file.read(end - start).decode()
+    reader = _csv_reader_with_strip(
+        csv.reader(io.StringIO(text), delimiter="|"))
+    fields = []
+    tag_counts = array("I")
+    for title, url, tags in map(_row_from_fields, reader):
+        fields.append(title)
+        fields.append(url)
+        fields.extend(tags)
+        tag_counts.append(len(tags))
+    return _FIELD_SEPARATOR.join(fields), tag_counts
+
+
+def _rows_from_chunk(chunk):
+    """Yields the (title, url, tags) rows of a chunk from _parse_chunk."""
+    text, tag_counts = chunk
+    fields = text.split(_FIELD_SEPARATOR)
+    start = 0
+    for tag_count in tag_counts:
+        end = start + 2 + tag_count
+        yield fields[start], fields[start + 1], fields[start + 2:end]
+        start = end
+
+
+def _parse_rows_parallel(path, workers):
+    """Parses the catalog file in chunks across a pool of processes.
+
+    Rows are yielded back in file order, so a video_id that appears more
+    than once still resolves to its last row.
+    """
+    # A few chunks per worker keeps the pool busy if some chunks parse slower.
+    ranges = _chunk_boundaries(path, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _parse_chunk, *zip(*((path, start, end) for start, end in ranges)))
+        for chunk in chunks:
+            yield from _rows_from_chunk(chunk)
+
+
+def _read_rows(path, workers=None):
+    """Yields the catalog rows, parsed in parallel if workers > 1."""
+    if workers and workers > 1:
+        return _parse_rows_parallel(path, workers)
+    return _parse_rows(path)
+
+
+def _load_catalog(path, workers=None):
+    """Parses the whole catalog file into a video_id -> Video dict."""
+    videos = {}
+    for title, url, tags in _read_rows(path, workers):
+        videos[url] = Video(title, url, tags)
+    return videos
+
+
+class VideoLibrary:
+    """A class used to represent a Video Library."""
+
+    def __init__(self, video_file=None, lazy=False, snapshot=False,
+                 workers=None):
+        """The VideoLibrary class is initialized.
+
+        Args:
+            video_file: Path to a pipe-delimited catalog file. Defaults to the
+                bundled videos.txt.
+            lazy: If True, memory-map the catalog and only build Video objects
+                when they are looked up or iterated over.
+            snapshot: If True, load the catalog from its precompiled binary
+                snapshot, compiling (or recompiling) it first if the catalog
+                file has changed since.
+            workers: If more than 1, parse the catalog file in chunks across
+                this many processes.
+        """
+        if lazy and (snapshot or workers):
+            raise ValueError(
+                "lazy loading cannot be combined with snapshot or workers")
+        self._path = Path(video_file) if video_file else _DEFAULT_CATALOG
+        self._workers = workers
+        self._videos = self._open_catalog(lazy, snapshot)
+
+        # Ordinals and indexes are only built once a search needs them, so a
+        # lazily loaded catalog stays lazy until then.
+        self._video_ids = None
+        self._ordinals = None
+        self._listeners = []
+        self._title_index = None
+        self._tag_index = None
+        self._fuzzy_index = None
+        self._autocomplete = None
+        self._playable = None
+        self._title_order = None
+
+    def _open_catalog(self, lazy, snapshot):
+        """Returns the video_id -> Video mapping backing this library."""
+        if lazy:
+            return _MappedCatalog(self._path)
+        if snapshot:
+            videos = catalog_snapshot.load_snapshot(self._path)
+            if videos is not None:
+                return videos
+        if not snapshot:
+            return _load_catalog(self._path, self._workers)
+        # Fingerprint the file before parsing it, so a change made meanwhile
+        # makes the snapshot stale rather than wrong. Failing to write the
+        # snapshot only costs the next load a parse.
+        fingerprint = catalog_snapshot.source_fingerprint(self._path)
+        videos = _load_catalog(self._path, self._workers)
+        catalog_snapshot.compile_snapshot(videos.values(), self._path,
+                                          fingerprint=fingerprint)
+        return videos
+
+    def reload(self):
+        """Re-reads the catalog file and applies the differences in place.
+
+        Videos that are still in the catalog keep their Video object (and
+        with it their flag state), with the title and tags updated if they
+        changed. Only added videos get new Video objects.
+
+        Returns:
+            A CatalogChanges listing the added, removed and updated videos.
+        """
+        rows = {url: (title, tuple(tags))
+                for title, url, tags in _read_rows(self._path, self._workers)}
+        lazy = isinstance(self._videos, _MappedCatalog)
+        if lazy:
+            for video_id in self._videos.remap(self._path):
+                self._forget_ordinal(video_id)
+
+        removed = [video_id for video_id in self._videos
+                   if video_id not in rows]
+        changes = CatalogChanges([], [], [])
+        for video_id in removed:
+            changes.removed.append(self._remove_video(video_id))
+
+        for video_id, (title, tags) in rows.items():
+            if video_id not in self._videos:
+                video = Video(title, video_id, tags)
+                self._add_video(video)
+                changes.added.append(video)
+                continue
+            # A lazy catalog reads unbuilt rows from the new file anyway, so
+            # only the videos already built can be out of date.
+            if lazy:
+                video = self._videos.built(video_id)
+            else:
+                video = self._videos[video_id]
+            if video is not None and (
+                    video.title != title or video.tags != tags):
+                self._update_video(video, title, tags)
+                changes.updated.append(video)
+        return changes
+
+    def _ensure_ordinals(self):
+        """Numbers the videos in catalog order, the first time it is needed."""
+        if self._video_ids is None:
+            self._video_ids = list(self._videos)
+            self._ordinals = {
+                video_id: ordinal
+                for ordinal, video_id in enumerate(self._video_ids)
+            }
+
+    def _notify(self, event, video):
+        if self._listeners:
+            ordinal = self._ordinals[video.video_id]
+            for listener in self._listeners:
+                getattr(listener, event)(ordinal, video)
+
+    def _add_video(self, video):
+        self._videos[video.video_id] = video
+        if self._video_ids is not None:
+            self._ordinals[video.video_id] = len(self._video_ids)
+            self._video_ids.append(video.video_id)
+            self._notify("video_added", video)
+
+    def _remove_video(self, video_id):
+        video = self._videos.pop(video_id)
+        if self._video_ids is not None:
+            self._notify("video_removed", video)
+            self._forget_ordinal(video_id)
+        return video
+
+    def _forget_ordinal(self, video_id):
+        if self._video_ids is not None:
+            # Leave a hole so the other videos keep their ordinals.
+            self._video_ids[self._ordinals.pop(video_id)] = None
+
+    def _update_video(self, video, title, tags):
+        self._notify("video_removed", video)
+        video.update(title, tags)
+        # Write the change back for catalogs that persist it.
+        self._videos[video.video_id] = video
+        self._notify("video_added", video)
+
+    def add_listener(self, listener, replay=True):
+        """Registers a LibraryListener to be told about changes to the videos.
+
+        Args:
+            listener: The LibraryListener.
+            replay: If True, the listener is first sent a video_added for
+                every current video, e.g. to build an index.
+        """
+        self._ensure_ordinals()
+        if replay:
+            for video in self._videos.values():
+                listener.video_added(self._ordinals[video.video_id], video)
+        self._listeners.append(listener)
+
+    def video_at(self, ordinal):
+        """Returns the video with the given ordinal, None if it was removed."""
+        video_id = self._video_ids[ordinal]
+        return None if video_id is None else self._videos[video_id]
+
+    def iter_title_matches(self, search_term):
+        """Yields (ordinal, video) for each unflagged video whose title
+        contains search_term, in no particular order.
+
+        Matching is case insensitive. Nothing is collected up front, so a
+        caller that keeps only some matches needs no memory for the rest.
+
+        Args:
+            search_term: The query to be used in search.
+        """
+        search_term = search_term.lower()
+        if self._title_index is None:
+            self._title_index = TrigramIndex()
+            self.add_listener(self._title_index)
+
+        candidates = self._title_index.candidates(search_term)
+        if candidates is None:
+            candidates = range(len(self._video_ids))
+        for ordinal in candidates:
+            video = self.video_at(ordinal)
+            if (video is not None and not video.flag
+                    and search_term in video.title.lower()):
+                yield ordinal, video
+
+    def random_video(self):
+        """Returns a random unflagged video, None if there are none."""
+        if self._playable is None:
+            self._playable = PlayablePool()
+            self.add_listener(self._playable)
+        ordinal = self._playable.choice()
+        return None if ordinal is None else self.video_at(ordinal)
+
+    def shuffled_videos(self, seed=None):
+        """Yields every unflagged video once, in a random order.
+
+        The order is computed lazily, so the walk uses O(1) memory. Videos
+        flagged or removed during the walk are skipped when reached; videos
+        added during the walk are not included.
+
+        Args:
+            seed: Picks the order. A random one if None.
+        """
+        self._ensure_ordinals()
+        for ordinal in LazyPermutation(len(self._video_ids), seed):
+            video = self.video_at(ordinal)
+            if video is not None and not video.flag:
+                yield video
+
+    def search_titles(self, search_term):
+        """Returns the unflagged videos whose titles contain search_term.
+
+        Matching is case insensitive and the videos are in catalog order.
+
+        Args:
+            search_term: The query to be used in search.
+        """
+        matches = sorted(self.iter_title_matches(search_term),
+                         key=itemgetter(0))
+        return [video for _, video in matches]
+
+    def search_fuzzy(self, search_term, threshold=0.3, limit=10,
+                     max_candidates=10000):
+        """Returns the unflagged videos whose titles best resemble a query.
+
+        Tolerates typos by comparing the trigrams of the words of the query
+        and of each title, rather than requiring an exact substring.
+
+        Args:
+            search_term: The query, possibly misspelt.
+            threshold: The minimum trigram similarity, between 0 and 1.
+            limit: The maximum number of videos to return.
+            max_candidates: The maximum number of titles scored, which bounds
+                the time a query can take.
+
+        Returns:
+            The videos, most similar first, ties in catalog order.
+        """
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex()
+            self.add_listener(self._fuzzy_index)
+
+        matches = (
+            (-similarity, ordinal) for similarity, ordinal in
+            self._fuzzy_index.similar(search_term, threshold, max_candidates)
+            if not self.video_at(ordinal).flag)
+        return [self.video_at(ordinal)
+                for _, ordinal in heapq.nsmallest(limit, matches)]
+
+    def autocomplete(self, prefix, limit=10):
+        """Suggests title words and tags starting with prefix.
+
+        Args:
+            prefix: What the user has typed so far, matched case
+                insensitively.
+            limit: The maximum number of suggestions.
+
+        Returns:
+            Lowercased words and tags, those in the most unflagged videos
+            first.
+        """
+        if self._autocomplete is None:
+            self._autocomplete = Autocomplete()
+            self.add_listener(self._autocomplete)
+        return self._autocomplete.complete(prefix.lower(), limit)
+
+    def _ensure_tag_index(self):
+        if self._tag_index is None:
+            self._tag_index = TagIndex()
+            self.add_listener(self._tag_index)
+        return self._tag_index
+
+    def search_tag(self, video_tag):
+        """Returns the unflagged videos carrying video_tag.
 
+        Matching is case insensitive and the videos are in catalog order.
+
+        Args:
+            video_tag: The video tag to be used in search.
+        """
+        tag_index = self._ensure_tag_index()
+        matches = tag_index.postings(video_tag.lower()) - tag_index.flagged
+        return [self.video_at(ordinal) for ordinal in matches]
+
+    def search_tags(self, expression):
+        """Returns the unflagged videos matching a boolean tag query.
+
+        Args:
+            expression: A query such as "#cat AND #animal NOT #google"; see
+                tag_query for the syntax.
+
+        Returns:
+            The matching videos in catalog order.
+
+        Raises:
+            TagQueryError: If the query cannot be parsed.
+        """
+        tag_index = self._ensure_tag_index()
+        matches = tag_query.evaluate(
+            expression, tag_index.postings, tag_index.videos)
+        return [self.video_at(ordinal)
+                for ordinal in matches - tag_index.flagged]
+
+    def flag_video(self, video, reason):
+        """Marks a video as flagged.
+
+        Args:
+            video: The Video to flag.
+            reason: Reason for flagging the video.
+        """
+        video.flag_video(reason)
+        self._notify("video_flag_changed", video)
+
+    def allow_video(self, video):
+        """Removes the flag from a video.
+
+        Args:
+            video: The Video to allow again.
+        """
+        video.unflag_video()
+        self._notify("video_flag_changed", video)
 
     def get_all_videos(self):
         """Returns all available video information from the video library."""
         return list(self._videos.values())
 
+    def __len__(self):
+        """Returns the number of videos, without reading any of them."""
+        return len(self._videos)
+
+    def _ensure_title_order(self):
+        if self._title_order is None:
+            self._title_order = TitleIndex()
+            self.add_listener(self._title_order)
+
+    def iter_videos_by_title(self, start_title=None):
+        """Yields the videos sorted by title.
+
+        The order is kept up to date as videos are added and removed, so
+        the walk needs no sorting and reaching start_title is a binary
+        search. The library should not change during the walk.
+
+        Args:
+            start_title: Start at the first video with this title or a
+                later one. From the first video if None.
+        """
+        self._ensure_title_order()
+        start = None if start_title is None else (start_title,)
+        for _, ordinal in self._title_order.keys_after(start):
+            yield self.video_at(ordinal)
+
+    def get_videos_page(self, limit=None, offset=0, cursor=None):
+        """Returns one page of the videos, sorted by title.
+
+        The page is found by a binary search on the maintained title order,
+        so it costs only its own size. The cursor names the last video of
+        the previous page by title rather than by position, so videos added
+        or removed before it do not shift the next page.
+
+        Args:
+            limit: The maximum number of videos on the page, all if None.
+            offset: The number of videos to skip first.
+            cursor: The cursor of the previous page, to get the next one.
+
+        Returns:
+            A (videos, cursor) pair. The cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        self._ensure_title_order()
+        after = decode_cursor(cursor, str, int) if cursor else None
+        keys = self._title_order.keys_after(after, offset)
+        page = list(islice(keys, limit))
+        videos = [self.video_at(ordinal) for _, ordinal in page]
+
+        next_cursor = None
+        if page and limit is not None and next(keys, None) is not None:
+            next_cursor = encode_cursor(*page[-1])
+        return videos, next_cursor
+
     def get_video(self, video_id):
         """Returns the video object (title, url, tags) from the video library.
 
@@ -1,19 +1,35 @@
 """A video player class."""
 
 from typing import ValuesView
-from .video_playlist import Playlist
+from .output import StdoutSink, flush_output
+from .playlist_registry import PlaylistRegistry
 from .video_library import VideoLibrary
-import random
+from .tag_query import TagQueryError
+from .video_search import VideoSearch
 
 
 class VideoPlayer:
     """A class used to represent a Video Player."""
 
-    def __init__(self):
-        self._video_library = VideoLibrary()
+    def __init__(self, video_library=None, output=None):
+        """The VideoPlayer class is initialized.
+
+        Args:
+            video_library: The VideoLibrary to play from. Defaults to one
+                loaded from the bundled videos.txt.
+            output: The OutputSink to write to. Defaults to buffered
+                standard output, flushed once per command.
+        """
+        if video_library is None:
+            video_library = VideoLibrary()
+        self._video_library = video_library
+        self.output = output or StdoutSink()
+        self._search = VideoSearch(self._video_library)
+        self._last_results = []
+        self._shuffle = None
         self.current_video = None
         self.pause = False
-        self.playlists = {}
+        self.playlists = PlaylistRegistry()
 
     def check_video_exists(self, video_id):
         """Checks if a given video_id exists in the Video Library
@@ -29,7 +45,7 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        return playlist_name.lower() in [p.lower() for p in self.playlists.keys()]
+        return self.playlists.exists(playlist_name)
     
     def video_details(self, v):
         """Return str version of a video for output
@@ -37,12 +53,7 @@ class VideoPlayer:
         Args:
             video: Video object to be output
         """
-        all_tags, flagstr = "", ""
-        if str(v.tags):
-            all_tags = str(v.tags).replace("'", "").replace(",", "").replace("(", "").replace(")", "")
-        if v.flag:
-            flagstr  = f"- FLAGGED (reason: {v.flag_reason})"
-        return f" {v.title} ({v.video_id}) [{all_tags}] {flagstr}"
+        return v.details
 
     def print_videos(self, videos):
         """Prints video titles line by line from a list of videos
@@ -51,20 +62,39 @@ class VideoPlayer:
             videos: List of videos to be displayed.
         """
 
-        for v in videos:
-            print(self.video_details(v))
+        #Each video caches its line, so this is a single join
+        if videos:
+            self.output.print("\n".join([v.details for v in videos]))
 
+    @flush_output
     def number_of_videos(self):
         """Returns the number of videos"""
-        num_videos = len(self._video_library.get_all_videos())
-        print(f"{num_videos} videos in the library")
+        num_videos = len(self._video_library)
+        self.output.print(f"{num_videos} videos in the library")
 
-    def show_all_videos(self):
-        """Returns all videos."""
-        vids = sorted(self._video_library.get_all_videos(), key=lambda x: x.title)
-        print("Here's a list of all available videos:")
+    @flush_output
+    def show_all_videos(self, limit=None, offset=0, cursor=None):
+        """Returns all videos, sorted by title.
+
+        Args:
+            limit: The number of videos per page. All videos if None.
+            offset: The number of videos to skip first.
+            cursor: The cursor printed with the previous page.
+        """
+        try:
+            vids, next_cursor = self._video_library.get_videos_page(
+                limit, offset, cursor)
+        except ValueError as e:
+            self.output.print(f"Cannot show videos: {e}")
+            return
+        self.output.print("Here's a list of all available videos:")
         self.print_videos(vids)
+        #Tell the user how to get the next page, if there is one
+        if next_cursor:
+            self.output.print(f"More videos: SHOW_ALL_VIDEOS LIMIT {limit} "
+                              f"CURSOR {next_cursor}")
 
+    @flush_output
     def play_video(self, video_id):
         """Plays the respective video.
 
@@ -78,95 +108,109 @@ class VideoPlayer:
             
             #check if video is flagged
             if video.flag:
-                print(f"Cannot play video: Video is currently flagged (reason: {video.flag_reason})")
+                self.output.print(f"Cannot play video: Video is currently flagged (reason: {video.flag_reason})")
                 return
             #If there is a video currently playing, stop video
             if self.current_video:
-                print("Stopping video:", self.current_video.title)
+                self.output.print("Stopping video:", self.current_video.title)
 
             #print playing video and update current video
-            print("Playing video:", video.title)
+            self.output.print("Playing video:", video.title)
             self.current_video = video
             self.pause = False
         
         else:
-            print("Cannot play video: Video does not exist")
+            self.output.print("Cannot play video: Video does not exist")
 
+    @flush_output
     def stop_video(self):
         """Stops the current video."""
 
         #If there is a video currently playing, stop video
         if self.current_video:
-            print("Stopping video:", self.current_video.title)
+            self.output.print("Stopping video:", self.current_video.title)
             self.current_video = None
         
         #print no video message video 
         else:
-            print("Cannot stop video: No video is currently playing")
+            self.output.print("Cannot stop video: No video is currently playing")
 
+    @flush_output
     def play_random_video(self):
         """Plays a random video from the video library."""
-        #No videos?
-        all_videos = self._video_library.get_all_videos()
-        if not len(all_videos):
-            print("No videos available")
+        #Pick from the unflagged videos only
+        video = self._video_library.random_video()
+        if not video:
+            self.output.print("No videos available")
             return
-        
-        non_flagged_videos = []
-        #Go through all videos and find all non-flagged
-        for v in all_videos:
-            if not v.flag:
-                non_flagged_videos.append(v)
-        
-        num_videos = len(non_flagged_videos)
-        #If there are no non-flagged, display warning
-        if not num_videos:
-            print("No videos available")
 
-        
-        else:
-            random_number = random.randint(0, num_videos-1)
-            vid_id = self._video_library.get_all_videos()[random_number].video_id
-            self.play_video(vid_id)
-            self.pause = False
+        self.play_video(video.video_id)
+        self.pause = False
 
+    @flush_output
+    def shuffle_videos(self):
+        """Starts playing every video once in a random order."""
+        self._shuffle = self._video_library.shuffled_videos()
+        if not self._play_next_shuffled():
+            self.output.print("No videos available")
+
+    @flush_output
+    def next_video(self):
+        """Plays the next video of the shuffle."""
+        if not self._shuffle:
+            self.output.print("Cannot play next video: Shuffle is not on")
+            return
+        if not self._play_next_shuffled():
+            self.output.print("Shuffle complete: Every video has been played")
+
+    def _play_next_shuffled(self):
+        """Plays the next shuffled video, returns False once there are none."""
+        video = next(self._shuffle, None)
+        if not video:
+            self._shuffle = None
+            return False
+        self.play_video(video.video_id)
+        return True
+
+    @flush_output
     def pause_video(self):
         """Pauses the current video."""
         if not self.current_video:
-            print("Cannot pause video: No video is currently playing")
+            self.output.print("Cannot pause video: No video is currently playing")
             return
         elif self.pause:
-            print(f"Video already paused: {self.current_video.title}")
+            self.output.print(f"Video already paused: {self.current_video.title}")
             return
         else:
-            print(f"Pausing video: {self.current_video.title}")
+            self.output.print(f"Pausing video: {self.current_video.title}")
             self.pause = True
     
+    @flush_output
     def continue_video(self):
         """Resumes playing the current video."""
         if not self.current_video:
-            print("Cannot continue video: No video is currently playing")
+            self.output.print("Cannot continue video: No video is currently playing")
             return
         if not self.pause:
-            print("Cannot continue video: Video is not paused")
+            self.output.print("Cannot continue video: Video is not paused")
         else:
-            print(f"Continuing video: {self.current_video.title}")
+            self.output.print(f"Continuing video: {self.current_video.title}")
             self.pause = False
 
+    @flush_output
     def show_playing(self):
         """Displays video currently playing."""
 
         if self.current_video:
-            v = self.current_video
-            if str(v.tags):
-                all_tags = str(v.tags).replace("'", "").replace(",", "").replace("(", "").replace(")", "")
+            #Flagged videos stop playing, so the listing line has no flag
             p = ""
             if self.pause:
                 p = "- PAUSED"
-            print(f"Currently playing: {v.title} ({v.video_id}) [{all_tags}] {p}")
+            self.output.print(f"Currently playing:{self.current_video.details}{p}")
         else:
-            print("No video is currently playing")
+            self.output.print("No video is currently playing")
 
+    @flush_output
     def create_playlist(self, playlist_name):
         """Creates a playlist with a given name.
 
@@ -174,13 +218,13 @@ class VideoPlayer:
             playlist_name: The playlist name.
         """
 
-        if self.check_pl_exists(playlist_name):
-            print("Cannot create playlist: A playlist with the same name already exists")
+        #the registry refuses names that exist in any case
+        if self.playlists.create(playlist_name) is None:
+            self.output.print("Cannot create playlist: A playlist with the same name already exists")
         else:
-            #store playlist in their lowercase format
-            self.playlists[playlist_name.lower()] = Playlist(playlist_name)
-            print(f"Successfully created new playlist: {playlist_name} ")
+            self.output.print(f"Successfully created new playlist: {playlist_name} ")
 
+    @flush_output
     def add_to_playlist(self, playlist_name, video_id):
         """Adds a video to a playlist with a given name.
 
@@ -190,70 +234,83 @@ class VideoPlayer:
         """
         #if playlist doesn't exist, show warning
         if not self.check_pl_exists(playlist_name):
-            print(f"Cannot add video to {playlist_name}: Playlist does not exist")
+            self.output.print(f"Cannot add video to {playlist_name}: Playlist does not exist")
             return
         
         #if video doesn't exist, show warning
         if not self.check_video_exists(video_id):
-            print(f"Cannot add video to {playlist_name}: Video does not exist")
+            self.output.print(f"Cannot add video to {playlist_name}: Video does not exist")
             return
         
         #if video already in playlist don't add
-        if self.playlists[playlist_name.lower()].get_video(video_id):
-            print(f"Cannot add video to {playlist_name}: Video already added")
+        if self.playlists.get(playlist_name).get_video(video_id):
+            self.output.print(f"Cannot add video to {playlist_name}: Video already added")
             return
         
         selected_video = self._video_library.get_video(video_id)
 
         #check if video is flagged
         if selected_video.flag:
-            print(f"Cannot add video to {playlist_name}: Video is currently flagged (reason: {selected_video.flag_reason})")
+            self.output.print(f"Cannot add video to {playlist_name}: Video is currently flagged (reason: {selected_video.flag_reason})")
             return
         
         #add video to playlist
-        self.playlists[playlist_name.lower()].add_video(selected_video)
-        print(f"Added video to {playlist_name}: {selected_video.title}")
+        self.playlists.add_video(self.playlists.get(playlist_name), selected_video)
+        self.output.print(f"Added video to {playlist_name}: {selected_video.title}")
         
+    @flush_output
     def show_all_playlists(self):
         """Display all playlists."""
 
         #if no playlists, show warning
         if not len(self.playlists):
-            print("No playlists exist yet")
+            self.output.print("No playlists exist yet")
         
         #Otherwise, show all playlists
         else:
-            print("Showing all playlists:")
-            sorted_playlists = sorted(self.playlists.items())
-            for (_, value) in sorted_playlists:
-                print(value.get_orginal_name())
+            self.output.print("Showing all playlists:")
+            for playlist in self.playlists:
+                self.output.print(playlist.get_orginal_name())
 
-    def show_playlist(self, playlist_name):
+    @flush_output
+    def show_playlist(self, playlist_name, limit=None, offset=0, cursor=None):
         """Display all videos in a playlist with a given name.
 
         Args:
             playlist_name: The playlist name.
+            limit: The number of videos per page. All videos if None.
+            offset: The number of videos to skip first.
+            cursor: The cursor printed with the previous page.
         """
         #Check if playlist exists, if doesn't shwo warning
         if not self.check_pl_exists(playlist_name):
-            print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
+            self.output.print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
             return
         
         #Playlist must exist
         else:
             #Get chosen playlist
-            playlist = self.playlists[playlist_name.lower()]
-            print(f"Showing playlist: {playlist_name}")
+            playlist = self.playlists.get(playlist_name)
+            try:
+                videos, next_cursor = playlist.get_page(limit, offset, cursor)
+            except ValueError as e:
+                self.output.print(f"Cannot show playlist {playlist_name}: {e}")
+                return
+            self.output.print(f"Showing playlist: {playlist_name}")
 
-            videos = playlist.get_all_videos()
             #If there are no videos, show message
-            if not len(videos):
-                print(" No videos here yet")
+            if not len(playlist):
+                self.output.print(" No videos here yet")
             
-            #otherwise, show all videos
+            #otherwise, show the requested videos
             else:
                 self.print_videos(videos)
+                if next_cursor:
+                    self.output.print(
+                        f"More videos: SHOW_PLAYLIST {playlist_name} "
+                        f"LIMIT {limit} CURSOR {next_cursor}")
 
+    @flush_output
     def remove_from_playlist(self, playlist_name, video_id):
         """Removes a video to a playlist with a given name.
 
@@ -263,25 +320,26 @@ class VideoPlayer:
         """
         #if playlist doesn't exist, show warning
         if not self.check_pl_exists(playlist_name):
-            print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
+            self.output.print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
             return
         
         #if video doesn't exist, show warning
         if not self.check_video_exists(video_id):
-            print(f"Cannot remove video from {playlist_name}: Video does not exist")
+            self.output.print(f"Cannot remove video from {playlist_name}: Video does not exist")
             return
         
         #check if video in playlist, if not show warning
-        playlist = self.playlists[playlist_name.lower()]
+        playlist = self.playlists.get(playlist_name)
         if not playlist.get_video(video_id):
-            print(f"Cannot remove video from {playlist_name}: Video is not in playlist")
+            self.output.print(f"Cannot remove video from {playlist_name}: Video is not in playlist")
             return
         
         #Finally delete video from playlist
-        deleted = playlist.delete_video(video_id)
+        deleted = self.playlists.remove_video(playlist, video_id)
         if deleted:
-            print(f"Removed video from {playlist_name}: {deleted.title}")
+            self.output.print(f"Removed video from {playlist_name}: {deleted.title}")
 
+    @flush_output
     def clear_playlist(self, playlist_name):
         """Removes all videos from a playlist with a given name.
 
@@ -290,16 +348,17 @@ class VideoPlayer:
         """
         #if playlist doesn't exist, show warning
         if not self.check_pl_exists(playlist_name):
-            print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
+            self.output.print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
             return
         
         #Otherwise, find playlist and clear
         else:
             #Get Playlist
-            playlist = self.playlists[playlist_name.lower()]
-            playlist.delete_all_vids()
-            print(f"Successfully removed all videos from {playlist_name}")
+            playlist = self.playlists.get(playlist_name)
+            self.playlists.clear(playlist)
+            self.output.print(f"Successfully removed all videos from {playlist_name}")
 
+    @flush_output
     def delete_playlist(self, playlist_name):
         """Deletes a playlist with a given name.
 
@@ -308,105 +367,152 @@ class VideoPlayer:
         """
         #if playlist doesn't exist, show warning
         if not self.check_pl_exists(playlist_name):
-            print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
+            self.output.print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
             return
         
         #Otherwise, the playlist exists, delete it
         else:
-            if self.playlists.pop(playlist_name.lower(), None):
-                print(f"Deleted playlist: {playlist_name}")
+            if self.playlists.delete(playlist_name) is not None:
+                self.output.print(f"Deleted playlist: {playlist_name}")
    
-    def search_videos(self, original_search_term):
-        """Display all the videos whose titles contain the search_term.
+    @flush_output
+    def show_playlists_containing(self, video_id):
+        """Display the playlists a video has been added to.
 
         Args:
-            search_term: The query to be used in search.
+            video_id: The video_id to look for.
+        """
+        video = self.check_video_exists(video_id)
+        if not video:
+            self.output.print(f"Cannot show playlists containing {video_id}: Video does not exist")
+            return
+
+        playlists = self.playlists.playlists_containing(video_id)
+        if not playlists:
+            self.output.print(f"No playlists contain {video.title}")
+            return
+
+        self.output.print(f"Playlists containing {video.title}:")
+        for playlist in playlists:
+            self.output.print(f"  {playlist.get_orginal_name()}")
+
+    @flush_output
+    def show_search_results(self, search_term, choice_of_vids):
+        """Lists search results and offers to play one of them.
+
+        Args:
+            search_term: The query, as the user typed it.
+            choice_of_vids: The matching videos, in display order.
         """
-        search_term = original_search_term.lower()
-        videos = self._video_library.get_all_videos()
-
-        i = 0
-        choice_of_vids = []
-        #Go through all videos, searching for term, print choices
-        for vid in videos:
-            #skip video if flagged
-            if vid.flag:
-                continue
-            #If search term in title of video
-            if search_term in vid.title.lower():
-                i += 1
-                if i == 1:
-                    print(f"Here are the results for {original_search_term}:")
-                
-                #Keep a list of videos to choose from
-                choice_of_vids.append(vid)
-                v = self.video_details(vid)
-                print(f"{i}){v}")
-       
+        #Remember the results so PLAY_RESULT can pick one later
+        self._last_results = choice_of_vids
+
         #No matches, show warning
-        if not i:
-            print(f"No search results for {original_search_term}")
+        if not choice_of_vids:
+            self.output.print(f"No search results for {search_term}")
             return
+
+        self.output.print(f"Here are the results for {search_term}:")
+        self.output.print("\n".join([f"{i}){vid.details}"
+                                      for i, vid in enumerate(choice_of_vids, 1)]))
         
         #Get input on what they would like to play
         try:
-            print("Would you like to play any of the above? If yes, specify the number of the video. ")
-            print("If your answer is not a valid number, we will assume it's a no.")
+            self.output.print("Would you like to play any of the above? If yes, specify the number of the video. ")
+            self.output.print("If your answer is not a valid number, we will assume it's a no.")
+            #Show the prompt before waiting for the answer
+            self.output.flush()
             choice = int(input(""))
         except ValueError:
             return
         #If choice is within parameters, play choice 
-        if choice >0 and choice <= i:
+        if choice >0 and choice <= len(choice_of_vids):
             video = choice_of_vids[choice-1]
             self.play_video(video.video_id)
 
+    @flush_output
+    def play_result(self, result_number):
+        """Plays one of the results of the last search.
+
+        Args:
+            result_number: The number the result was listed with, from 1.
+        """
+        if not self._last_results:
+            self.output.print("Cannot play result: No search results to choose from")
+            return
+
+        try:
+            choice = int(result_number)
+        except ValueError:
+            choice = 0
+        if choice < 1 or choice > len(self._last_results):
+            self.output.print("Cannot play result: Please specify a number "
+                              f"between 1 and {len(self._last_results)}")
+            return
+        self.play_video(self._last_results[choice-1].video_id)
+
+    @flush_output
+    def search_videos(self, original_search_term):
+        """Display all the videos whose titles contain the search_term.
+
+        Args:
+            search_term: The query to be used in search.
+        """
+        result = self._search.titles(original_search_term)
+        self.show_search_results(original_search_term, result.matches)
+
+    @flush_output
     def search_videos_tag(self, video_tag):
         """Display all videos whose tags contains the provided tag.
 
         Args:
             video_tag: The video tag to be used in search.
         """
-        search_term = video_tag.lower()
-        videos = self._video_library.get_all_videos()
-
-        i = 0
-        choice_of_vids = []
-        #Go through all videos, searching for term in tag, print choices
-        for vid in videos:
-            #skip video if flagged
-            if vid.flag:
-                continue
-
-            #If search term in tags of video
-            tags = [t.lower() for t in vid.tags]
-            if search_term in tags:
-                i += 1
-                if i == 1:
-                    print(f"Here are the results for {video_tag}:")
-                
-                #Keep a list of videos to choose from
-                choice_of_vids.append(vid)
-                v = self.video_details(vid)
-                print(f"{i}){v}")
-        
-        #No matches, show warning
-        if not i :
-            print(f"No search results for {video_tag}")
+        result = self._search.tag(video_tag)
+        self.show_search_results(video_tag, result.matches)
+
+    @flush_output
+    def search_fuzzy(self, search_term):
+        """Display the videos whose titles most resemble the search_term,
+        tolerating typos.
+
+        Args:
+            search_term: The query to be used in search.
+        """
+        result = self._search.fuzzy_titles(search_term)
+        self.show_search_results(search_term, result.matches)
+
+    @flush_output
+    def autocomplete(self, prefix):
+        """Display title words and tags that complete a prefix.
+
+        Args:
+            prefix: The start of a word or tag.
+        """
+        suggestions = self._video_library.autocomplete(prefix)
+        if not suggestions:
+            self.output.print(f"No suggestions for {prefix}")
             return
-        
-        #Get input on what they would like to play
+        self.output.print(f"Suggestions for {prefix}:")
+        for suggestion in suggestions:
+            self.output.print(f"  {suggestion}")
+
+    @flush_output
+    def search_tags(self, expression):
+        """Display all videos matching a boolean tag query.
+
+        Args:
+            expression: Tags combined with AND, OR, NOT and parentheses,
+                e.g. "#cat AND #animal NOT #google".
+        """
         try:
-            print("Would you like to play any of the above? If yes, specify the number of the video. ")
-            print("If your answer is not a valid number, we will assume it's a no.")
-            choice = int(input(""))
-        except ValueError:
+            result = self._search.tags(expression)
+        except TagQueryError as e:
+            self.output.print(f"Cannot search tags: {e}")
             return
-        
-        #If choice is within parameters, play choice 
-        if choice >0 and choice <= i:
-            video = choice_of_vids[choice-1]
-            self.play_video(video.video_id)
-    
+        self.show_search_results(expression, result.matches)
+
+    @flush_output
     def flag_video(self, video_id, flag_reason=""):
         """Mark a video as flagged.
 
@@ -420,24 +526,25 @@ class VideoPlayer:
             
             #if already flagged, display warning
             if video.flag:
-               print("Cannot flag video: Video is already flagged")
+               self.output.print("Cannot flag video: Video is already flagged")
             else:
                 #if flag_reason is empty, use 'Not Supplied'
                 if not len(flag_reason):
                     flag_reason = "Not supplied"
 
-                video.flag_video(flag_reason)
+                self._video_library.flag_video(video, flag_reason)
                 if self.current_video:
                     if self.current_video.video_id == video_id:
                         self.stop_video()
-                print(f"Successfully flagged video: {video.title} (reason: {flag_reason})")
+                self.output.print(f"Successfully flagged video: {video.title} (reason: {flag_reason})")
 
         
         #Video doesn't not exist, display warning
         else:
-            print("Cannot flag video: Video does not exist")
+            self.output.print("Cannot flag video: Video does not exist")
  
 
+    @flush_output
     def allow_video(self, video_id):
         """Removes a flag from a video.
 
@@ -450,12 +557,29 @@ class VideoPlayer:
 
             #If video is flagged unflag
             if video.flag:
-                video.unflag_video()
-                print(f"Successfully removed flag from video: {video.title}")
+                self._video_library.allow_video(video)
+                self.output.print(f"Successfully removed flag from video: {video.title}")
             else:
-                print("Cannot remove flag from video: Video is not flagged")
+                self.output.print("Cannot remove flag from video: Video is not flagged")
 
 
         #Video doesn't not exist, display warning
         else:
-            print("Cannot remove flag from video: Video does not exist")
+            self.output.print("Cannot remove flag from video: Video does not exist")
+
+    @flush_output
+    def reload_library(self):
+        """Picks up changes to the catalog file without losing player state."""
+        changes = self._video_library.reload()
+
+        #Removed videos can no longer be played or kept in playlists
+        if changes.removed:
+            removed_ids = {video.video_id for video in changes.removed}
+            if self.current_video and self.current_video.video_id in removed_ids:
+                self.stop_video()
+            for video_id in removed_ids:
+                for playlist in self.playlists.playlists_containing(video_id):
+                    self.playlists.remove_video(playlist, video_id)
+
+        self.output.print(f"Reloaded library: {len(changes.added)} added, "
+              f"{len(changes.removed)} removed, {len(changes.updated)} updated")
@@ -1,15 +1,103 @@
 """A video playlist class."""
+from .cursor import decode_cursor, encode_cursor
 from .video import Video
+import random
+
+
+class _Node:
+    """A node of an implicit treap: ordered by position, not by key."""
+
+    __slots__ = ("video", "priority", "size", "left", "right", "parent")
+
+    def __init__(self, video):
+        self.video = video
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    if node.left:
+        node.left.parent = node
+    if node.right:
+        node.right.parent = node
+
+
+def _split(node, count):
+    """Splits a treap into its first `count` nodes and the rest."""
+    if node is None:
+        return None, None
+    if _size(node.left) < count:
+        node.right, rest = _split(node.right, count - _size(node.left) - 1)
+        _update(node)
+        if rest:
+            rest.parent = None
+        return node, rest
+    first, node.left = _split(node.left, count)
+    _update(node)
+    if first:
+        first.parent = None
+    return first, node
+
+
+def _merge(first, second):
+    """Joins two treaps, all of first's nodes coming before second's."""
+    if first is None or second is None:
+        return first or second
+    if first.priority > second.priority:
+        first.right = _merge(first.right, second)
+        _update(first)
+        return first
+    second.left = _merge(first, second.left)
+    _update(second)
+    return second
+
+
+def _in_order(node):
+    stack = []
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node.video
+        node = node.right
 
 
 class Playlist:
-    """A class used to represent a Playlist."""
+    """A class used to represent a Playlist.
+
+    Videos are kept in an implicit treap (a randomly balanced tree ordered
+    by position), so inserting, moving or removing at any position and
+    reading a range take O(log n), while a video_id -> node dict keeps
+    membership checks O(1).
+    """
     def __init__(self, name):
-        self._videos = {}
+        self._root = None
+        self._nodes = {}
         self._original_name = name
     
     def add_video(self, video):
-        self._videos[video.video_id] = video
+        self.insert_video(len(self._nodes), video)
+
+    def insert_video(self, index, video):
+        """Inserts a video so it ends up at the given position.
+
+        Args:
+            index: The position, from 0. Clamped to the playlist length.
+            video: The Video to insert. Must not be in the playlist yet.
+        """
+        node = self._nodes[video.video_id] = _Node(video)
+        first, rest = _split(self._root, index)
+        self._root = _merge(_merge(first, node), rest)
+        self._root.parent = None
 
     def get_video(self, video_id):
         """Returns the video object (title, url, tags) from the video library.
@@ -21,16 +109,110 @@ class Playlist:
             The Video object for the requested video_id. None if the video
             does not exist.
         """
-        return self._videos.get(video_id, None) 
+        node = self._nodes.get(video_id, None)
+        return node.video if node else None
+
+    def index_of(self, video_id):
+        """Returns the position of a video in the playlist.
+
+        Raises:
+            KeyError: If the video is not in the playlist.
+        """
+        node = self._nodes[video_id]
+        index = _size(node.left)
+        while node.parent:
+            if node is node.parent.right:
+                index += _size(node.parent.left) + 1
+            node = node.parent
+        return index
     
     def get_orginal_name(self):
         return  self._original_name
     
     def get_all_videos(self):
-        return self._videos.values()
+        return list(_in_order(self._root))
+
+    def slice(self, start, stop):
+        """Returns the videos at positions start (inclusive) to stop
+        (exclusive), without walking the videos before start.
+        """
+        first, rest = _split(self._root, start)
+        middle, last = _split(rest, max(0, stop - start))
+        videos = list(_in_order(middle))
+        self._root = _merge(_merge(first, middle), last)
+        if self._root:
+            self._root.parent = None
+        return videos
+
+    def get_page(self, limit=None, offset=0, cursor=None):
+        """Returns one page of the playlist.
+
+        The cursor names the last video of the previous page, so the next
+        page starts right after that video even if videos were inserted or
+        removed before it.
+
+        Args:
+            limit: The maximum number of videos on the page, all if None.
+            offset: The number of videos to skip first.
+            cursor: The cursor of the previous page, to get the next one.
+
+        Returns:
+            A (videos, cursor) pair. The cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed, or the video it names
+                has been removed from the playlist.
+        """
+        start = offset
+        if cursor:
+            video_id, = decode_cursor(cursor, str)
+            if video_id not in self._nodes:
+                raise ValueError("Cursor is no longer valid")
+            start += self.index_of(video_id) + 1
+        stop = len(self._nodes) if limit is None else start + limit
+        videos = self.slice(start, stop)
+
+        next_cursor = None
+        if videos and stop < len(self._nodes):
+            next_cursor = encode_cursor(videos[-1].video_id)
+        return videos, next_cursor
+
+    def remove_at(self, index):
+        """Removes and returns the video at a position.
+
+        Raises:
+            IndexError: If there is no video at that position.
+        """
+        if not 0 <= index < len(self._nodes):
+            raise IndexError("playlist index out of range")
+        first, rest = _split(self._root, index)
+        node, last = _split(rest, 1)
+        self._root = _merge(first, last)
+        if self._root:
+            self._root.parent = None
+        del self._nodes[node.video.video_id]
+        return node.video
+
+    def move_video(self, video_id, index):
+        """Moves a video to a new position.
+
+        Raises:
+            KeyError: If the video is not in the playlist.
+        """
+        video = self.remove_at(self.index_of(video_id))
+        self.insert_video(index, video)
     
     def delete_video(self, video_id):
-        return self._videos.pop(video_id, None)
+        if video_id not in self._nodes:
+            return None
+        return self.remove_at(self.index_of(video_id))
     
     def delete_all_vids(self):
-        self._videos.clear()
+        self._root = None
+        self._nodes.clear()
+
+    def __contains__(self, video_id):
+        return video_id in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
@@ -0,0 +1,244 @@
+"""A programmatic search API over a video library."""
+
+from .batch_search import batch_search
+from .cursor import decode_cursor, encode_cursor
+from .search_cache import SearchCache, TAG, TITLE
+from operator import itemgetter
+import heapq
+import re
+
+
+class SearchResult:
+    """A class used to represent one page of search results.
+
+    Attributes:
+        query: The search term, tag or tag query that was searched for.
+        matches: The matching Video objects on this page: in catalog order
+            for title and tag searches, best match first for fuzzy and
+            ranked ones.
+        count: The total number of matches across all pages.
+        cursor: Pass this back to the same search to get the next page. None
+            if this is the last page.
+    """
+
+    def __init__(self, query, matches, count, cursor=None):
+        self.query = query
+        self.matches = matches
+        self.count = count
+        self.cursor = cursor
+
+    def __repr__(self):
+        return (f"SearchResult(query={self.query!r}, count={self.count}, "
+                f"matches={len(self.matches)}, cursor={self.cursor!r})")
+
+
+def _check_limit(limit):
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        raise ValueError("limit must be a positive number of matches")
+
+
+def _decode_search_cursor(query, cursor, *types):
+    """Returns the values after the query in a cursor made for query, which
+    must have the given types.
+    """
+    cursor_query, *values = decode_cursor(cursor, str, *types)
+    if cursor_query != query:
+        raise ValueError("Search cursor belongs to a different query")
+    return values
+
+
+def _page(query, videos, limit, cursor):
+    start = 0
+    if cursor:
+        start, = _decode_search_cursor(query, cursor, int)
+        if start < 0:
+            raise ValueError("Invalid cursor")
+    if limit is None:
+        return SearchResult(query, videos[start:], len(videos))
+    _check_limit(limit)
+    end = start + limit
+    return SearchResult(query, videos[start:end], len(videos),
+                        encode_cursor(query, end) if end < len(videos)
+                        else None)
+
+
+def _rank_key(search_term, query_words, ordinal, video):
+    """Returns the sort key of a title match; smaller keys rank higher.
+
+    A match scores higher the earlier the term appears in the title, if it
+    is a whole word (or words) rather than part of one, and for every query
+    word that is also one of the video's tags. Ties keep catalog order.
+    """
+    title = video.title.lower()
+    position = title.find(search_term)
+    end = position + len(search_term)
+    # An empty query matches an empty title too.
+    score = 1 - position / max(len(title), 1)
+    if ((position == 0 or not title[position - 1].isalnum())
+            and (end == len(title) or not title[end].isalnum())):
+        score += 1
+    tags = {tag.lower().lstrip("#") for tag in video.tags}
+    score += len(query_words & tags)
+    return -score, ordinal
+
+
+class VideoSearch:
+    """A class used to search a Video Library without any user interaction.
+
+    Every search skips flagged videos and returns a SearchResult, so callers
+    such as servers or batch jobs can run searches back to back. Title and
+    tag searches are answered from a SearchCache when the same query was
+    run recently and nothing it depends on has changed since.
+
+    Attributes:
+        cache: The SearchCache, whose hits and misses can be inspected.
+    """
+
+    def __init__(self, video_library, cache_size=1024, cache_ttl=None):
+        """The VideoSearch class is initialized.
+
+        Args:
+            video_library: The VideoLibrary to search.
+            cache_size: The maximum number of cached title and tag searches.
+            cache_ttl: Seconds a cached search stays valid, or None to keep
+                it until it is evicted or invalidated.
+        """
+        self._video_library = video_library
+        self.cache = SearchCache(cache_size, cache_ttl)
+        # Registered by the first cached search: listening numbers the
+        # videos, which a lazy library should not do before it must.
+        self._cache_listening = False
+
+    def _cached(self, kind, query, search):
+        if not self._cache_listening:
+            self._video_library.add_listener(self.cache, replay=False)
+            self._cache_listening = True
+        videos = self.cache.get(kind, query)
+        if videos is None:
+            videos = search(query)
+            self.cache.put(kind, query, videos)
+        return videos
+
+    def titles(self, search_term, limit=None, cursor=None):
+        """Finds the videos whose titles contain search_term.
+
+        Args:
+            search_term: The query, matched case insensitively.
+            limit: The maximum number of matches to return. All if None.
+            cursor: The cursor of the previous page, to get the next one.
+
+        Raises:
+            ValueError: If limit is not a positive number, or the cursor is
+                malformed or belongs to another query.
+        """
+        videos = self._cached(TITLE, search_term.lower(),
+                              self._video_library.search_titles)
+        return _page(search_term, videos, limit, cursor)
+
+    def tag(self, video_tag, limit=None, cursor=None):
+        """Finds the videos carrying video_tag.
+
+        Args:
+            video_tag: The tag, matched case insensitively.
+            limit: The maximum number of matches to return. All if None.
+            cursor: The cursor of the previous page, to get the next one.
+
+        Raises:
+            ValueError: If limit is not a positive number, or the cursor is
+                malformed or belongs to another query.
+        """
+        videos = self._cached(TAG, video_tag.lower(),
+                              self._video_library.search_tag)
+        return _page(video_tag, videos, limit, cursor)
+
+    def tags(self, expression, limit=None, cursor=None):
+        """Finds the videos matching a boolean tag query.
+
+        Args:
+            expression: Tags combined with AND, OR, NOT and parentheses.
+            limit: The maximum number of matches to return. All if None.
+            cursor: The cursor of the previous page, to get the next one.
+
+        Raises:
+            TagQueryError: If the query cannot be parsed.
+            ValueError: If limit is not a positive number, or the cursor is
+                malformed or belongs to another query.
+        """
+        videos = self._video_library.search_tags(expression)
+        return _page(expression, videos, limit, cursor)
+
+    def batch(self, terms=(), tags=()):
+        """Runs many title and tag searches in a single pass over the library.
+
+        Args:
+            terms: Search terms to look for in titles.
+            tags: Tags to look for.
+
+        Returns:
+            A BatchResult mapping each term and each tag to its matching
+            videos, in catalog order.
+        """
+        return batch_search(self._video_library.get_all_videos(), terms, tags)
+
+    def fuzzy_titles(self, search_term, threshold=0.3, limit=10):
+        """Finds the videos whose titles most resemble a possibly misspelt
+        search_term.
+
+        Args:
+            search_term: The query.
+            threshold: The minimum trigram similarity, between 0 and 1.
+            limit: The maximum number of matches to return.
+
+        Returns:
+            A SearchResult with the most similar videos first.
+        """
+        videos = self._video_library.search_fuzzy(
+            search_term, threshold, limit)
+        return SearchResult(search_term, videos, len(videos))
+
+    def ranked_titles(self, search_term, limit=10, cursor=None):
+        """Finds the best matching videos whose titles contain search_term.
+
+        Matches are ranked by where the term appears in the title, whether
+        it is a whole word and how many query words are also tags. Only the
+        best `limit` matches are kept while scanning, so memory is bounded
+        by the page size however many videos match. The returned cursor is
+        an opaque string marking the last match on the page: the next page
+        is the best `limit` matches ranked after it, so earlier pages are
+        never collected again.
+
+        Args:
+            search_term: The query, matched case insensitively.
+            limit: The number of matches per page.
+            cursor: The cursor of the previous page, to get the next one.
+
+        Raises:
+            ValueError: If limit is not a positive number, or the cursor is
+                malformed or belongs to another query.
+        """
+        _check_limit(limit)
+        term = search_term.lower()
+        query_words = set(re.findall(r"\w+", term))
+        after = None
+        if cursor:
+            after = tuple(_decode_search_cursor(
+                search_term, cursor, float, int))
+
+        count = 0
+        remaining = 0
+
+        def ranked():
+            nonlocal count, remaining
+            for ordinal, video in self._video_library.iter_title_matches(term):
+                count += 1
+                rank_key = _rank_key(term, query_words, ordinal, video)
+                if after is None or rank_key > after:
+                    remaining += 1
+                    yield rank_key, video
+
+        page = heapq.nsmallest(limit, ranked(), key=itemgetter(0))
+        next_cursor = None
+        if remaining > limit:
+            next_cursor = encode_cursor(search_term, *page[-1][0])
+        return SearchResult(search_term, [video for _, video in page], count,
+                            next_cursor)
@@ -0,0 +1,68 @@
+import random
+
+from src.autocomplete import RadixTree
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_radix_tree_completes_most_frequent_first():
+    tree = RadixTree()
+    for word, count in (("cat", 3), ("cats", 1), ("catalog", 3),
+                        ("car", 5), ("dog", 2)):
+        tree.add(word, count)
+
+    assert tree.complete("ca", 10) == ["car", "cat", "catalog", "cats"]
+    assert tree.complete("cat", 2) == ["cat", "catalog"]
+    assert tree.complete("cata", 10) == ["catalog"]
+    assert tree.complete("", 2) == ["car", "cat"]
+    assert tree.complete("cab", 10) == []
+    assert tree.complete("catalogue", 10) == []
+
+    tree.add("car", -5)
+    tree.add("catalog", -3)
+    assert tree.complete("ca", 10) == ["cat", "cats"]
+
+
+def test_radix_tree_matches_brute_force():
+    rng = random.Random(7)
+    tree = RadixTree()
+    counts = {}
+    for _ in range(2000):
+        word = "".join(rng.choice("abc") for _ in range(rng.randint(1, 5)))
+        if counts.get(word) and rng.random() < 0.4:
+            tree.add(word, -1)
+            counts[word] -= 1
+        else:
+            tree.add(word, 1)
+            counts[word] = counts.get(word, 0) + 1
+    for prefix in ("", "a", "ab", "abc", "cc", "bca"):
+        expected = sorted((w for w, c in counts.items()
+                           if c and w.startswith(prefix)),
+                          key=lambda w: (-counts[w], w))[:5]
+        assert tree.complete(prefix, 5) == expected
+
+
+def test_library_autocomplete_skips_flagged_videos():
+    library = VideoLibrary()
+    assert library.autocomplete("#") == [
+        "#animal", "#cat", "#career", "#dog", "#google"]
+    assert library.autocomplete("am") == ["amazing"]
+
+    library.flag_video(library.get_video("amazing_cats_video_id"), "no_cats")
+    assert library.autocomplete("am") == []
+    assert library.autocomplete("ca") == ["cat"]
+    library.allow_video(library.get_video("amazing_cats_video_id"))
+    assert library.autocomplete("ca") == ["cat", "cats"]
+
+
+def test_autocomplete(capfd):
+    player = VideoPlayer()
+    player.autocomplete("#CA")
+    player.autocomplete("xyz")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 4
+    assert "Suggestions for #CA:" in lines[0]
+    assert "#cat" in lines[1]
+    assert "#career" in lines[2]
+    assert "No suggestions for xyz" in lines[3]
@@ -0,0 +1,37 @@
+import random
+
+from src.batch_search import AhoCorasick
+from src.video_library import VideoLibrary
+from src.video_search import VideoSearch
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick(["he", "she", "his", "hers", "cat"])
+    assert automaton.matches("ushers") == {"he", "she", "hers"}
+    assert automaton.matches("this") == {"his"}
+    assert automaton.matches("dog") == set()
+    assert AhoCorasick(["", "a"]).matches("b") == {""}
+
+
+def test_aho_corasick_matches_brute_force():
+    rng = random.Random(3)
+    patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4)))
+                for _ in range(20)]
+    automaton = AhoCorasick(patterns)
+    for _ in range(50):
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+        assert automaton.matches(text) == {p for p in patterns if p in text}
+
+
+def test_batch_matches_single_searches():
+    library = VideoLibrary()
+    library.flag_video(library.get_video("funny_dogs_video_id"), "no_dogs")
+    search = VideoSearch(library)
+    terms = ["cat", "CAT", "video", "o", "blah", "At G"]
+    tags = ["#animal", "#CAT", "#dog", "#none"]
+
+    result = search.batch(terms, tags)
+    for term in terms:
+        assert result.titles[term] == search.titles(term).matches
+    for tag in tags:
+        assert result.tags[tag] == search.tag(tag).matches
@@ -0,0 +1,98 @@
+import os
+
+from src import catalog_snapshot
+from src.video_library import VideoLibrary
+
+
+CATALOG = (
+    "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+    "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n"
+    "Video about nothing | nothing_video_id |\n"
+)
+
+
+def _write_catalog(tmp_path, text=CATALOG):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(text)
+    return catalog
+
+
+def test_snapshot_library_matches_text_library(tmp_path):
+    catalog = _write_catalog(tmp_path)
+    text_library = VideoLibrary(catalog)
+    first = VideoLibrary(catalog, snapshot=True)
+    second = VideoLibrary(catalog, snapshot=True)
+
+    assert catalog_snapshot.snapshot_path_for(catalog).exists()
+    assert isinstance(second._videos, catalog_snapshot.SnapshotCatalog)
+    for library in (first, second):
+        videos = library.get_all_videos()
+        assert [v.video_id for v in videos] == \
+            [v.video_id for v in text_library.get_all_videos()]
+        for video in videos:
+            expected = text_library.get_video(video.video_id)
+            assert video.title == expected.title
+            assert video.tags == expected.tags
+    assert second.get_video("nothing_video_id").tags == ()
+    assert second.get_video("does_not_exist") is None
+
+
+def test_snapshot_is_rebuilt_when_source_changes(tmp_path):
+    catalog = _write_catalog(tmp_path)
+    VideoLibrary(catalog, snapshot=True)
+
+    catalog.write_text(CATALOG + "Brand New | new_video_id | #new\n")
+    assert catalog_snapshot.load_snapshot(catalog) is None
+
+    library = VideoLibrary(catalog, snapshot=True)
+    assert len(library.get_all_videos()) == 4
+    assert library.get_video("new_video_id").tags == ("#new",)
+    assert catalog_snapshot.load_snapshot(catalog) is not None
+
+
+def test_snapshot_survives_touch_with_same_content(tmp_path):
+    catalog = _write_catalog(tmp_path)
+    VideoLibrary(catalog, snapshot=True)
+    stat = os.stat(catalog)
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert catalog_snapshot.load_snapshot(catalog) is not None
+
+
+def test_truncated_or_padded_snapshot_is_ignored(tmp_path):
+    catalog = _write_catalog(tmp_path)
+    VideoLibrary(catalog, snapshot=True)
+    path = catalog_snapshot.snapshot_path_for(catalog)
+    data = path.read_bytes()
+
+    for broken in (data[:-1], data[:-20], data[:70], data + b"\0\0\0\0"):
+        path.write_bytes(broken)
+        assert catalog_snapshot.load_snapshot(catalog) is None
+
+    library = VideoLibrary(catalog, snapshot=True)
+    assert len(library.get_all_videos()) == 3
+    assert path.read_bytes() == data
+
+
+def test_snapshot_write_failure_falls_back_to_parsing(tmp_path):
+    catalog = _write_catalog(tmp_path)
+    # A directory where the snapshot should go makes every write fail.
+    snapshot_path = catalog_snapshot.snapshot_path_for(catalog)
+    snapshot_path.mkdir()
+
+    assert not catalog_snapshot.compile_snapshot([], catalog)
+    library = VideoLibrary(catalog, snapshot=True)
+    assert len(library.get_all_videos()) == 3
+    assert not (tmp_path / (snapshot_path.name + ".tmp")).exists()
+
+
+def test_snapshot_records_source_as_it_was_before_parsing(tmp_path):
+    catalog = _write_catalog(tmp_path)
+    fingerprint = catalog_snapshot.source_fingerprint(catalog)
+    videos = VideoLibrary(catalog)._videos
+    # The file changes after it was fingerprinted and parsed.
+    catalog.write_text(CATALOG + "Brand New | new_video_id | #new\n")
+    catalog_snapshot.compile_snapshot(videos.values(), catalog,
+                                      fingerprint=fingerprint)
+
+    assert catalog_snapshot.load_snapshot(catalog) is None
@@ -0,0 +1,51 @@
+import pytest
+
+from src.command_parser import CommandException, CommandParser
+from src.video_player import VideoPlayer
+
+
+def test_commands_are_case_insensitive(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["play", "amazing_cats_video_id"])
+    parser.execute_command(["Unknown_Command"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines[0] == "Playing video: Amazing Cats"
+    assert lines[1] == ("Please enter a valid command, type HELP for a list "
+                        "of available commands.")
+
+
+def test_wrong_number_of_arguments_keeps_usage_message():
+    parser = CommandParser(VideoPlayer())
+    with pytest.raises(CommandException, match="followed by a playlist name "
+                                               "and video_id to add"):
+        parser.execute_command(["ADD_TO_PLAYLIST", "my_playlist"])
+    with pytest.raises(CommandException, match="optional flag reason"):
+        parser.execute_command(["FLAG_VIDEO", "a", "b", "c"])
+
+
+def test_register_command_at_runtime(capfd):
+    parser = CommandParser(VideoPlayer())
+    calls = []
+    parser.register_command("ECHO", lambda *words: calls.append(words), 1,
+                            help_line="ECHO <words> - Repeats the words.")
+    parser.execute_command(["echo", "hello", "there"])
+    assert calls == [("hello", "there")]
+    with pytest.raises(CommandException, match="ECHO"):
+        parser.execute_command(["ECHO"])
+
+    parser.register_command("ECHO", lambda *words: None, 1,
+                            help_line="ECHO <words> - Ignores the words.")
+    parser.execute_command(["HELP"])
+    out, err = capfd.readouterr()
+    assert "ECHO <words> - Ignores the words." in out
+    assert "Repeats the words" not in out
+    assert out.index("EXIT - ") < out.index("More commands:") \
+        < out.index("ECHO <words>")
+
+
+def test_commands_without_arguments_ignore_extra_words(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["NUMBER_OF_VIDEOS", "please"])
+    out, err = capfd.readouterr()
+    assert out == "5 videos in the library\n"
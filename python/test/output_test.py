@@ -0,0 +1,63 @@
+import socket
+
+from src.command_parser import CommandParser
+from src.output import MemorySink, SocketSink
+from src.video_player import VideoPlayer
+
+
+def test_memory_sink_collects_a_command_at_a_time():
+    output = MemorySink()
+    player = VideoPlayer(output=output)
+    player.play_video("amazing_cats_video_id")
+    player.show_playing()
+    assert output.getvalue() == (
+        "Playing video: Amazing Cats\n"
+        "Currently playing: Amazing Cats (amazing_cats_video_id) "
+        "[#cat #animal] \n")
+
+    output.clear()
+    CommandParser(player).execute_command(["NOT_A_COMMAND"])
+    assert output.getvalue() == (
+        "Please enter a valid command, type HELP for a list of available "
+        "commands.\n")
+
+
+def test_output_is_buffered_until_the_command_ends(capfd):
+    player = VideoPlayer()
+    player.output.print("Queued")
+    out, err = capfd.readouterr()
+    assert out == ""
+
+    player.number_of_videos()
+    out, err = capfd.readouterr()
+    assert out == "Queued\n5 videos in the library\n"
+
+
+def test_socket_sink_sends_whole_commands():
+    sending, receiving = socket.socketpair()
+    with sending, receiving:
+        player = VideoPlayer(output=SocketSink(sending))
+        player.show_all_playlists()
+        assert receiving.recv(1024) == b"No playlists exist yet\n"
+
+
+class CountingSink(MemorySink):
+    def __init__(self):
+        super().__init__()
+        self.sends = 0
+
+    def _send(self, text):
+        self.sends += 1
+        super()._send(text)
+
+
+def test_each_command_is_sent_once():
+    output = CountingSink()
+    parser = CommandParser(VideoPlayer(output=output))
+    parser.execute_command(["PLAY", "amazing_cats_video_id"])
+    for command in (["FLAG_VIDEO", "amazing_cats_video_id"],
+                    ["SHOW_ALL_VIDEOS", "LIMIT", "2"],
+                    ["PLAY", "funny_dogs_video_id"]):
+        output.sends = 0
+        parser.execute_command(command)
+        assert output.sends == 1
@@ -1,4 +1,5 @@
 import re
+from src.cursor import encode_cursor
 from src.video_player import VideoPlayer
 
 
@@ -23,6 +24,33 @@ def test_show_all_videos(capfd):
     assert "Video about nothing (nothing_video_id) []" in lines[5]
 
 
+def test_show_all_videos_in_pages(capfd):
+    player = VideoPlayer()
+    player.show_all_videos(limit=2, offset=1)
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 4
+    assert "Another Cat Video (another_cat_video_id) [#cat #animal]" in lines[1]
+    assert "Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[2]
+    assert lines[3].startswith("More videos: SHOW_ALL_VIDEOS LIMIT 2 CURSOR ")
+
+    player.show_all_videos(limit=2, cursor=lines[3].split()[-1])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 3
+    assert "Life at Google (life_at_google_video_id) [#google #career]" in lines[1]
+    assert "Video about nothing (nothing_video_id) []" in lines[2]
+
+
+def test_show_all_videos_bad_cursor(capfd):
+    player = VideoPlayer()
+    for cursor in ("not a cursor", encode_cursor(1, 2),
+                   encode_cursor("Funny Dogs", True)):
+        player.show_all_videos(limit=2, cursor=cursor)
+        out, err = capfd.readouterr()
+        assert out == "Cannot show videos: Invalid cursor\n"
+
+
 def test_play_video(capfd):
     player = VideoPlayer()
     player.play_video("amazing_cats_video_id")
@@ -115,6 +115,31 @@ def test_show_playlist(capfd):
     assert "Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[5]
 
 
+def test_show_playlist_in_pages(capfd):
+    player = VideoPlayer()
+    player.create_playlist("my_cool_playlist")
+    player.add_to_playlist("my_cool_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_cool_playlist", "funny_dogs_video_id")
+    player.add_to_playlist("my_cool_playlist", "life_at_google_video_id")
+    capfd.readouterr()
+    player.show_playlist("my_cool_playlist", limit=2)
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 4
+    assert "Showing playlist: my_cool_playlist" in lines[0]
+    assert "Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[1]
+    assert "Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[2]
+    assert lines[3].startswith(
+        "More videos: SHOW_PLAYLIST my_cool_playlist LIMIT 2 CURSOR ")
+
+    player.show_playlist("my_cool_playlist", limit=2,
+                         cursor=lines[3].split()[-1])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 2
+    assert "Life at Google (life_at_google_video_id) [#google #career]" in lines[1]
+
+
 def test_remove_from_playlist_then_re_add(capfd):
     player = VideoPlayer()
     player.create_playlist("MY_playlist")
@@ -0,0 +1,29 @@
+from src.video_library import VideoLibrary
+
+
+def test_random_video_only_picks_unflagged_videos():
+    library = VideoLibrary()
+    for video_id in ("funny_dogs_video_id", "amazing_cats_video_id",
+                     "life_at_google_video_id", "nothing_video_id"):
+        library.flag_video(library.get_video(video_id), "flagged")
+
+    for _ in range(20):
+        assert library.random_video().video_id == "another_cat_video_id"
+
+    library.flag_video(library.get_video("another_cat_video_id"), "flagged")
+    assert library.random_video() is None
+
+    library.allow_video(library.get_video("nothing_video_id"))
+    assert library.random_video().video_id == "nothing_video_id"
+
+
+def test_random_video_follows_reload(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text("Funny Dogs | funny_dogs_video_id |  #dog\n")
+    library = VideoLibrary(catalog)
+    assert library.random_video().video_id == "funny_dogs_video_id"
+
+    catalog.write_text("Amazing Cats | amazing_cats_video_id |  #cat\n")
+    library.reload()
+    assert len(library._playable) == 1
+    assert library.random_video().video_id == "amazing_cats_video_id"
@@ -0,0 +1,93 @@
+from src.playlist_registry import PlaylistRegistry
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_registry_ignores_case():
+    registry = PlaylistRegistry()
+    playlist = registry.create("My_Playlist")
+    assert playlist.get_orginal_name() == "My_Playlist"
+    assert registry.create("my_PLAYLIST") is None
+    assert registry.exists("MY_playlist")
+    assert registry.get("my_playlist") is playlist
+    assert registry.get("other") is None
+
+    # casefold, unlike lower, also matches e.g. German sharp s.
+    registry.create("Straße")
+    assert registry.exists("STRASSE")
+
+
+def test_registry_lists_playlists_in_sorted_order():
+    registry = PlaylistRegistry()
+    for name in ("b_list", "C_list", "a_list", "B_LIST2"):
+        registry.create(name)
+    assert [p.get_orginal_name() for p in registry] == \
+        ["a_list", "b_list", "B_LIST2", "C_list"]
+
+    assert registry.delete("B_LIST").get_orginal_name() == "b_list"
+    assert registry.delete("b_list") is None
+    assert [p.get_orginal_name() for p in registry] == \
+        ["a_list", "B_LIST2", "C_list"]
+    assert len(registry) == 3
+
+
+def test_registry_tracks_playlists_containing_a_video():
+    library = VideoLibrary()
+    cats = library.get_video("amazing_cats_video_id")
+    dogs = library.get_video("funny_dogs_video_id")
+    registry = PlaylistRegistry()
+    first = registry.create("First")
+    second = registry.create("second")
+    third = registry.create("Third")
+    registry.add_video(second, cats)
+    registry.add_video(first, cats)
+    registry.add_video(third, cats)
+    registry.add_video(first, dogs)
+
+    assert registry.playlists_containing(cats.video_id) == \
+        [second, first, third]
+    registry.remove_video(second, cats.video_id)
+    registry.clear(third)
+    assert registry.playlists_containing(cats.video_id) == [first]
+
+    registry.delete("FIRST")
+    assert registry.playlists_containing(cats.video_id) == []
+    assert registry.playlists_containing(dogs.video_id) == []
+    assert registry._containing == {}
+
+
+def test_playlists_containing(capfd):
+    player = VideoPlayer()
+    player.create_playlist("my_playlist")
+    player.create_playlist("Other_Playlist")
+    player.add_to_playlist("other_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.show_playlists_containing("amazing_cats_video_id")
+    player.show_playlists_containing("funny_dogs_video_id")
+    player.show_playlists_containing("does_not_exist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 9
+    assert "Playlists containing Amazing Cats:" in lines[4]
+    assert "Other_Playlist" in lines[5]
+    assert "my_playlist" in lines[6]
+    assert "No playlists contain Funny Dogs" in lines[7]
+    assert ("Cannot show playlists containing does_not_exist: "
+            "Video does not exist") in lines[8]
+
+
+def test_registry_keeps_order_across_blocks():
+    registry = PlaylistRegistry(load=2)
+    names = [f"list_{i:02}" for i in (7, 3, 11, 0, 5, 9, 1, 10, 4, 8, 2, 6)]
+    for name in names:
+        registry.create(name.upper() if name.endswith("1") else name)
+    assert len(registry._blocks) > 1
+    assert [p.get_orginal_name().lower() for p in registry] == sorted(names)
+
+    for name in names[::2]:
+        assert registry.delete(name) is not None
+    assert [p.get_orginal_name().lower() for p in registry] == \
+        sorted(names[1::2])
+    for name in names[1::2]:
+        registry.delete(name)
+    assert list(registry) == [] and registry._blocks == []
@@ -0,0 +1,118 @@
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+CATALOG = (
+    "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+    "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n"
+    "Life at Google | life_at_google_video_id |  #google , #career\n"
+)
+
+
+def _player(tmp_path, text=CATALOG):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(text)
+    return catalog, VideoPlayer(VideoLibrary(catalog))
+
+
+def test_reload_applies_changes_in_place(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(CATALOG)
+    library = VideoLibrary(catalog)
+    cats = library.get_video("amazing_cats_video_id")
+    cats.flag_video("dont_like_cats")
+
+    catalog.write_text(
+        "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+        "Amazing Cats II | amazing_cats_video_id |  #cat\n"
+        "Brand New | new_video_id | #new\n")
+    changes = library.reload()
+
+    assert [v.video_id for v in changes.added] == ["new_video_id"]
+    assert [v.video_id for v in changes.removed] == ["life_at_google_video_id"]
+    assert changes.updated == [cats]
+    assert library.get_video("amazing_cats_video_id") is cats
+    assert cats.title == "Amazing Cats II"
+    assert cats.tags == ("#cat",)
+    assert cats.flag
+    assert library.get_video("life_at_google_video_id") is None
+    assert len(library.get_all_videos()) == 3
+
+
+def test_reload_lazy_library(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(CATALOG)
+    library = VideoLibrary(catalog, lazy=True)
+
+    catalog.write_text(CATALOG + "Brand New | new_video_id | #new\n")
+    changes = library.reload()
+
+    assert [v.video_id for v in changes.added] == ["new_video_id"]
+    assert library.get_video("new_video_id").title == "Brand New"
+    assert len(library.get_all_videos()) == 4
+
+
+def test_reload_lazy_library_after_rewrite(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(CATALOG)
+    library = VideoLibrary(catalog, lazy=True)
+    cats = library.get_video("amazing_cats_video_id")
+    # Numbers the videos without reading the other rows.
+    library._ensure_ordinals()
+
+    # Rewritten in place and shorter, so the old offsets are meaningless.
+    with open(catalog, "w") as catalog_file:
+        catalog_file.write(
+            "Dogs | funny_dogs_video_id | #dog\n"
+            "Cats | amazing_cats_video_id | #cat\n"
+            "New | new_video_id | #new\n")
+    changes = library.reload()
+
+    assert [v.video_id for v in changes.added] == ["new_video_id"]
+    assert changes.updated == [cats]
+    # Rows never read stay unread.
+    assert set(library._videos._videos) == \
+        {"amazing_cats_video_id", "new_video_id"}
+    assert cats.title == "Cats"
+    assert library.get_video("funny_dogs_video_id").title == "Dogs"
+    assert library.get_video("life_at_google_video_id") is None
+    titles = ["Cats", "Dogs", "New"]
+    assert sorted(v.title for v in library.get_all_videos()) == titles
+    assert sorted(v.title for v in library.shuffled_videos()) == titles
+
+
+def test_reload_library_keeps_player_state(tmp_path, capfd):
+    catalog, player = _player(tmp_path)
+    player.create_playlist("my_playlist")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_playlist", "funny_dogs_video_id")
+    player.play_video("amazing_cats_video_id")
+
+    catalog.write_text(
+        "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n"
+        "Life at Google | life_at_google_video_id |  #google , #career\n")
+    player.reload_library()
+    player.show_playing()
+    player.show_playlist("my_playlist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 8
+    assert "Reloaded library: 0 added, 1 removed, 0 updated" in lines[4]
+    assert "Currently playing: Amazing Cats (amazing_cats_video_id) " \
+           "[#cat #animal]" in lines[5]
+    assert "Showing playlist: my_playlist" in lines[6]
+    assert "Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[7]
+
+
+def test_reload_library_stops_removed_video(tmp_path, capfd):
+    catalog, player = _player(tmp_path)
+    player.play_video("funny_dogs_video_id")
+
+    catalog.write_text(
+        "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n")
+    player.reload_library()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 3
+    assert "Stopping video: Funny Dogs" in lines[1]
+    assert "Reloaded library: 0 added, 2 removed, 0 updated" in lines[2]
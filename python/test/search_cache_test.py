@@ -0,0 +1,95 @@
+from src.search_cache import SearchCache, TAG, TITLE
+from src.video_library import VideoLibrary
+from src.video_search import VideoSearch
+
+
+CATALOG = (
+    "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+    "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n"
+    "Another Cat Video | another_cat_video_id |  #cat , #animal\n"
+)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SearchCache(capacity=2)
+    cache.put(TITLE, "a", ["a"])
+    cache.put(TITLE, "b", ["b"])
+    assert cache.get(TITLE, "a") == ["a"]
+    cache.put(TAG, "c", ["c"])
+
+    assert cache.get(TITLE, "b") is None
+    assert cache.get(TITLE, "a") == ["a"]
+    assert cache.get(TAG, "c") == ["c"]
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_cache_entries_expire():
+    now = [0.0]
+    cache = SearchCache(ttl=10, clock=lambda: now[0])
+    cache.put(TITLE, "cat", ["cat"])
+    now[0] = 9.9
+    assert cache.get(TITLE, "cat") == ["cat"]
+    now[0] = 10.0
+    assert cache.get(TITLE, "cat") is None
+    assert len(cache) == 0
+
+
+def test_search_uses_cache_and_counts_hits():
+    search = VideoSearch(VideoLibrary())
+    first = search.titles("CAT")
+    second = search.titles("cat")
+    search.tag("#animal")
+    search.tag("#Animal")
+
+    assert [v.video_id for v in second.matches] == \
+        [v.video_id for v in first.matches]
+    assert (search.cache.hits, search.cache.misses) == (2, 2)
+
+
+def test_flagging_invalidates_only_affected_searches():
+    library = VideoLibrary()
+    search = VideoSearch(library)
+    search.titles("cat")
+    search.titles("dog")
+    search.tag("#cat")
+    search.tag("#dog")
+
+    cats = library.get_video("amazing_cats_video_id")
+    library.flag_video(cats, "dont_like_cats")
+    assert [v.video_id for v in search.titles("cat").matches] == \
+        ["another_cat_video_id"]
+    assert [v.video_id for v in search.tag("#cat").matches] == \
+        ["another_cat_video_id"]
+    search.titles("dog")
+    search.tag("#dog")
+    assert (search.cache.hits, search.cache.misses) == (2, 6)
+
+    library.allow_video(cats)
+    assert len(search.titles("cat").matches) == 2
+    assert search.cache.misses == 7
+
+
+def test_reload_invalidates_affected_searches(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(CATALOG)
+    library = VideoLibrary(catalog)
+    search = VideoSearch(library)
+    assert search.titles("cat").count == 2
+    assert search.tag("#dog").count == 1
+
+    catalog.write_text(CATALOG + "Cat Facts | cat_facts_video_id | #dog\n")
+    library.reload()
+    assert search.titles("cat").count == 3
+    assert search.tag("#dog").count == 2
+
+
+def test_cache_waits_for_first_search_to_listen():
+    library = VideoLibrary(lazy=True)
+    search = VideoSearch(library)
+    assert library._video_ids is None
+
+    search.titles("cat")
+    assert search.cache in library._listeners
+    library.flag_video(library.get_video("amazing_cats_video_id"), "flagged")
+    assert [v.video_id for v in search.titles("cat").matches] == \
+        ["another_cat_video_id"]
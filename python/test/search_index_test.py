@@ -0,0 +1,145 @@
+from src.video_library import VideoLibrary
+
+
+CATALOG = (
+    "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+    "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n"
+    "Another Cat Video | another_cat_video_id |  #cat , #animal\n"
+    "Life at Google | life_at_google_video_id |  #google , #career\n"
+    "Video about nothing | nothing_video_id |\n"
+)
+
+
+def _scan(library, term):
+    return [v for v in library.get_all_videos()
+            if not v.flag and term.lower() in v.title.lower()]
+
+
+def _library(tmp_path, text=CATALOG):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(text)
+    return catalog, VideoLibrary(catalog)
+
+
+def test_search_titles_matches_linear_scan(tmp_path):
+    catalog, library = _library(tmp_path)
+    library.flag_video(library.get_video("funny_dogs_video_id"), "no_dogs")
+    for term in ("cat", "CAT", "a", "", "video", "t v", "o", "Google",
+                 "nothing at all", "s"):
+        assert library.search_titles(term) == _scan(library, term)
+
+
+def test_search_titles_follows_flags(tmp_path):
+    catalog, library = _library(tmp_path)
+    cats = library.get_video("amazing_cats_video_id")
+    assert cats in library.search_titles("cat")
+
+    library.flag_video(cats, "dont_like_cats")
+    assert cats not in library.search_titles("cat")
+
+    library.allow_video(cats)
+    assert library.search_titles("cat")[0] is cats
+
+
+def test_search_titles_follows_reload(tmp_path):
+    catalog, library = _library(tmp_path)
+    assert len(library.search_titles("cat")) == 2
+
+    catalog.write_text(
+        "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+        "Amazing Kittens | amazing_cats_video_id |  #cat , #animal\n"
+        "Another Cat Video | another_cat_video_id |  #cat , #animal\n"
+        "Cat Facts | cat_facts_video_id | #cat\n")
+    library.reload()
+
+    assert [v.video_id for v in library.search_titles("cat")] == \
+        ["another_cat_video_id", "cat_facts_video_id"]
+    assert [v.video_id for v in library.search_titles("kitten")] == \
+        ["amazing_cats_video_id"]
+    assert library.search_titles("google") == []
+    for term in ("cat", "a", "at", "video"):
+        assert library.search_titles(term) == _scan(library, term)
+
+
+def _tag_scan(library, tag):
+    return [v for v in library.get_all_videos()
+            if not v.flag and tag.lower() in [t.lower() for t in v.tags]]
+
+
+def test_search_tag_matches_linear_scan(tmp_path):
+    catalog, library = _library(tmp_path)
+    library.flag_video(library.get_video("funny_dogs_video_id"), "no_dogs")
+    for tag in ("#animal", "#CAT", "#dog", "#google", "#blah", "", "cat"):
+        assert library.search_tag(tag) == _tag_scan(library, tag)
+
+
+def test_search_tag_follows_flags_and_reload(tmp_path):
+    catalog, library = _library(tmp_path)
+    cats = library.get_video("amazing_cats_video_id")
+    library.flag_video(cats, "dont_like_cats")
+    assert [v.video_id for v in library.search_tag("#cat")] == \
+        ["another_cat_video_id"]
+    library.allow_video(cats)
+    assert library.search_tag("#cat")[0] is cats
+
+    catalog.write_text(
+        "Amazing Cats | amazing_cats_video_id |  #animal\n"
+        "Cat Facts | cat_facts_video_id | #Cat\n")
+    library.reload()
+    assert [v.video_id for v in library.search_tag("#cat")] == \
+        ["cat_facts_video_id"]
+    assert [v.video_id for v in library.search_tag("#animal")] == \
+        ["amazing_cats_video_id"]
+
+
+def test_search_tag_removes_video_with_repeated_tags(tmp_path):
+    catalog, library = _library(tmp_path, "X | x | #a,#A\nY | y | #a,#a\n")
+    assert [v.video_id for v in library.search_tag("#a")] == ["x", "y"]
+
+    catalog.write_text("Y | y | #b\n")
+    library.reload()
+    assert library.search_tag("#a") == []
+    assert [v.video_id for v in library.search_tag("#b")] == ["y"]
+
+
+def test_search_fuzzy_tolerates_typos(tmp_path):
+    catalog, library = _library(tmp_path)
+    assert [v.video_id for v in library.search_fuzzy("amazng cats")][0] == \
+        "amazing_cats_video_id"
+    assert [v.video_id for v in library.search_fuzzy("gogle")] == \
+        ["life_at_google_video_id"]
+    assert library.search_fuzzy("zzzz") == []
+    assert library.search_fuzzy("") == []
+
+
+def test_search_fuzzy_matches_one_word_of_a_longer_title(tmp_path):
+    catalog, library = _library(tmp_path)
+    assert [v.video_id for v in library.search_fuzzy("googel")] == \
+        ["life_at_google_video_id"]
+    assert [v.video_id for v in library.search_fuzzy("nothng")] == \
+        ["nothing_video_id"]
+    assert {v.video_id for v in library.search_fuzzy("cat")} == \
+        {"amazing_cats_video_id", "another_cat_video_id"}
+    # The exact word ranks above the plural.
+    assert library.search_fuzzy("cat")[0].video_id == "another_cat_video_id"
+
+
+def test_search_fuzzy_threshold_and_flags(tmp_path):
+    catalog, library = _library(tmp_path)
+    assert library.search_fuzzy("amazng", threshold=0.99) == []
+
+    cats = library.get_video("amazing_cats_video_id")
+    library.flag_video(cats, "dont_like_cats")
+    assert cats not in library.search_fuzzy("amazng cats")
+    library.allow_video(cats)
+    assert library.search_fuzzy("amazng cats")[0] is cats
+
+
+def test_search_fuzzy_follows_reload(tmp_path):
+    catalog, library = _library(tmp_path)
+    assert library.search_fuzzy("kitens") == []
+
+    catalog.write_text(CATALOG + "Kittens | kittens_video_id | #cat\n")
+    library.reload()
+    assert [v.video_id for v in library.search_fuzzy("kitens")] == \
+        ["kittens_video_id"]
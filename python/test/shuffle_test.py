@@ -0,0 +1,53 @@
+from src.shuffle import LazyPermutation
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_lazy_permutation_visits_each_value_once():
+    for size in (0, 1, 2, 3, 5, 16, 17, 1000):
+        order = list(LazyPermutation(size, seed=size))
+        assert sorted(order) == list(range(size))
+    assert list(LazyPermutation(1000, seed=1)) == \
+        list(LazyPermutation(1000, seed=1))
+    assert list(LazyPermutation(1000, seed=1)) != list(range(1000))
+
+
+def test_shuffled_videos_skips_videos_flagged_during_walk():
+    library = VideoLibrary()
+    library.flag_video(library.get_video("nothing_video_id"), "flagged")
+    walk = library.shuffled_videos(seed=4)
+    first = next(walk)
+    remaining = {v.video_id for v in library.get_all_videos()
+                 if not v.flag} - {first.video_id}
+    skipped = sorted(remaining)[0]
+    library.flag_video(library.get_video(skipped), "flagged")
+
+    assert {v.video_id for v in walk} == remaining - {skipped}
+
+
+def test_shuffle_plays_each_video_once(capfd):
+    player = VideoPlayer()
+    player.next_video()
+    player.flag_video("nothing_video_id")
+    player.shuffle_videos()
+    for _ in range(4):
+        player.next_video()
+    player.next_video()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert "Cannot play next video: Shuffle is not on" in lines[0]
+    played = [line for line in lines if line.startswith("Playing video:")]
+    assert sorted(played) == [
+        "Playing video: Amazing Cats", "Playing video: Another Cat Video",
+        "Playing video: Funny Dogs", "Playing video: Life at Google"]
+    assert "Shuffle complete: Every video has been played" in lines[-2]
+    assert "Cannot play next video: Shuffle is not on" in lines[-1]
+
+
+def test_shuffle_no_videos(capfd):
+    player = VideoPlayer()
+    for video in player._video_library.get_all_videos():
+        player.flag_video(video.video_id)
+    player.shuffle_videos()
+    out, err = capfd.readouterr()
+    assert "No videos available" in out.splitlines()[-1]
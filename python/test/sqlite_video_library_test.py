@@ -0,0 +1,76 @@
+from src.sqlite_video_library import SqliteVideoLibrary
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_sqlite_library_matches_text_library(tmp_path):
+    text_library = VideoLibrary()
+    library = SqliteVideoLibrary(tmp_path / "videos.db")
+
+    videos = library.get_all_videos()
+    assert [(v.video_id, v.title, v.tags) for v in videos] == \
+        [(v.video_id, v.title, v.tags)
+         for v in text_library.get_all_videos()]
+    video = library.get_video("amazing_cats_video_id")
+    assert video.title == "Amazing Cats"
+    assert video.tags == ("#cat", "#animal")
+    assert library.get_video("nothing_video_id").tags == ()
+    assert library.get_video("does_not_exist") is None
+
+
+def test_sqlite_library_returns_same_video_while_referenced(tmp_path):
+    library = SqliteVideoLibrary(tmp_path / "videos.db")
+    video = library.get_video("amazing_cats_video_id")
+    assert library.get_video("amazing_cats_video_id") is video
+    assert video in library.get_all_videos()
+
+
+def test_sqlite_library_persists_flags(tmp_path):
+    database = tmp_path / "videos.db"
+    library = SqliteVideoLibrary(database)
+    library.flag_video(library.get_video("amazing_cats_video_id"),
+                       "dont_like_cats")
+    library.flag_video(library.get_video("funny_dogs_video_id"), "no_dogs")
+    library.allow_video(library.get_video("funny_dogs_video_id"))
+
+    reopened = SqliteVideoLibrary(database)
+    cats = reopened.get_video("amazing_cats_video_id")
+    assert cats.flag
+    assert cats.flag_reason == "dont_like_cats"
+    assert not reopened.get_video("funny_dogs_video_id").flag
+
+
+def test_sqlite_library_reload(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(
+        "Funny Dogs | funny_dogs_video_id |  #dog , #animal\n"
+        "Amazing Cats | amazing_cats_video_id |  #cat , #animal\n")
+    database = tmp_path / "videos.db"
+    library = SqliteVideoLibrary(database, catalog)
+
+    catalog.write_text(
+        "Amazing Cats II | amazing_cats_video_id |  #cat\n"
+        "Brand New | new_video_id | #new\n")
+    changes = library.reload()
+    assert len(changes.added) == len(changes.removed) == 1
+    assert len(changes.updated) == 1
+
+    reopened = SqliteVideoLibrary(database, catalog)
+    assert [(v.video_id, v.title, v.tags)
+            for v in reopened.get_all_videos()] == [
+        ("amazing_cats_video_id", "Amazing Cats II", ("#cat",)),
+        ("new_video_id", "Brand New", ("#new",)),
+    ]
+
+
+def test_player_with_sqlite_library(tmp_path, capfd):
+    player = VideoPlayer(SqliteVideoLibrary(tmp_path / "videos.db"))
+    player.number_of_videos()
+    player.flag_video("amazing_cats_video_id", "dont_like_cats")
+    player.show_all_videos()
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 8
+    assert "5 videos in the library" in lines[0]
+    assert ("Amazing Cats (amazing_cats_video_id) [#cat #animal] - FLAGGED "
+            "(reason: dont_like_cats)") in lines[3]
@@ -0,0 +1,111 @@
+import pytest
+import random
+from unittest import mock
+
+from src.bitmap import Bitmap
+from src.tag_query import TagQueryError, evaluate
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+
+def test_bitmap_set_operations():
+    evens = Bitmap(range(0, 200000, 2))
+    small = Bitmap([1, 2, 3, 4, 70000, 70001])
+
+    assert list(evens & small) == [2, 4, 70000]
+    assert list(small - evens) == [1, 3, 70001]
+    assert len(evens | small) == 100000 + 3
+    assert 70001 in small and 70002 not in small
+
+    small.discard(70000)
+    small.discard(70001)
+    assert list(small) == [1, 2, 3, 4]
+    assert small._containers.keys() == {0}
+
+
+def test_bitmap_matches_set_across_container_kinds():
+    rng = random.Random(5)
+    bitmap, model = Bitmap(), set()
+    # Values crowd into one container so it turns dense and back.
+    for _ in range(30000):
+        value = rng.randrange(65536, 65536 + 9000)
+        if rng.random() < 0.6:
+            bitmap.add(value)
+            model.add(value)
+        else:
+            bitmap.discard(value)
+            model.discard(value)
+    assert list(bitmap) == sorted(model)
+    assert len(bitmap) == len(model)
+    assert bitmap == Bitmap(sorted(model))
+
+    other_model = set(rng.sample(range(200000), 8000))
+    other = Bitmap(other_model)
+    assert list(bitmap & other) == sorted(model & other_model)
+    assert list(bitmap | other) == sorted(model | other_model)
+    assert list(bitmap - other) == sorted(model - other_model)
+    assert list(other - bitmap) == sorted(other_model - model)
+
+    # Results do not share containers with their inputs.
+    union = Bitmap() | other
+    union.add(200001)
+    assert 200001 not in other
+
+
+def test_sparse_bitmap_stores_values_not_bits():
+    bitmap = Bitmap([65535, 70000])
+    assert bitmap._containers == {0: [65535], 1: [70000 - 65536]}
+
+
+TAGS = {
+    "#cat": Bitmap([1, 2]),
+    "#animal": Bitmap([0, 1, 2]),
+    "#dog": Bitmap([0]),
+    "#google": Bitmap([2, 3]),
+}
+UNIVERSE = Bitmap(range(5))
+
+
+def _query(expression):
+    return list(evaluate(expression, lambda tag: TAGS.get(tag, Bitmap()),
+                         UNIVERSE))
+
+
+def test_evaluate_boolean_queries():
+    assert _query("#cat AND #animal NOT #google") == [1]
+    assert _query("#cat #animal not #GOOGLE") == [1]
+    assert _query("#dog OR #cat AND #google") == [0, 2]
+    assert _query("(#dog OR #cat) AND #google") == [2]
+    assert _query("NOT #animal") == [3, 4]
+    assert _query("NOT (#animal OR #google)") == [4]
+    assert _query("#missing") == []
+
+
+@pytest.mark.parametrize("expression", [
+    "", "#cat AND", "(#cat", "#cat)", "OR #cat", "NOT", "()"])
+def test_evaluate_rejects_malformed_queries(expression):
+    with pytest.raises(TagQueryError):
+        _query(expression)
+
+
+def test_library_search_tags_skips_flagged_videos():
+    library = VideoLibrary()
+    library.flag_video(library.get_video("amazing_cats_video_id"), "no_cats")
+    assert [v.video_id for v in library.search_tags("#animal NOT #dog")] == \
+        ["another_cat_video_id"]
+    assert [v.video_id for v in library.search_tags("NOT #animal")] == \
+        ["life_at_google_video_id", "nothing_video_id"]
+
+
+@mock.patch('builtins.input', lambda *args: 'No')
+def test_search_tags(capfd):
+    player = VideoPlayer()
+    player.search_tags("#animal AND NOT #dog")
+    player.search_tags("#cat AND")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert "Here are the results for #animal AND NOT #dog:" in lines[0]
+    assert "1) Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[1]
+    assert "2) Another Cat Video (another_cat_video_id) [#cat #animal]" in lines[2]
+    assert "Cannot search tags: Unexpected end of query" in lines[5]
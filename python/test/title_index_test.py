@@ -0,0 +1,42 @@
+import random
+
+from src.title_index import TitleIndex
+from src.video import Video
+
+
+def _video(title, i):
+    return Video(title, f"video_{i}_id", [])
+
+
+def test_title_index_matches_sorted_model():
+    rng = random.Random(3)
+    index = TitleIndex(load=4)
+    videos = {}
+    for step in range(500):
+        if videos and rng.random() < 0.4:
+            ordinal = rng.choice(list(videos))
+            index.video_removed(ordinal, videos.pop(ordinal))
+        else:
+            videos[step] = _video(f"title {rng.randrange(50)}", step)
+            index.video_added(step, videos[step])
+
+        model = sorted((video.title, ordinal)
+                       for ordinal, video in videos.items())
+        assert list(index.keys_after()) == model
+        assert len(index) == len(model)
+
+    key = ("title 25",)
+    offset = 3
+    expected = [k for k in model if k > key][offset:]
+    assert list(index.keys_after(key, offset)) == expected
+
+
+def test_title_index_resumes_after_removed_key():
+    index = TitleIndex(load=2)
+    videos = [_video(title, i) for i, title in enumerate("edcba")]
+    for ordinal, video in enumerate(videos):
+        index.video_added(ordinal, video)
+
+    index.video_removed(2, videos[2])
+    assert list(index.keys_after(("c", 2))) == [("d", 1), ("e", 0)]
+    assert list(index.keys_after(None, 10)) == []
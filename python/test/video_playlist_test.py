@@ -0,0 +1,87 @@
+import random
+import pytest
+
+from src.cursor import encode_cursor
+from src.video import Video
+from src.video_playlist import Playlist
+
+
+def _video(i):
+    return Video(f"Video {i}", f"video_{i}_id", [])
+
+
+def test_playlist_operations_match_list_model():
+    rng = random.Random(11)
+    playlist = Playlist("my_playlist")
+    model = []
+    next_id = 0
+    for _ in range(3000):
+        operation = rng.random()
+        if operation < 0.4 or not model:
+            video = _video(next_id)
+            next_id += 1
+            index = rng.randint(0, len(model))
+            playlist.insert_video(index, video)
+            model.insert(index, video)
+        elif operation < 0.6:
+            index = rng.randrange(len(model))
+            assert playlist.remove_at(index) is model.pop(index)
+        elif operation < 0.8:
+            video = rng.choice(model)
+            index = rng.randrange(len(model))
+            playlist.move_video(video.video_id, index)
+            model.remove(video)
+            model.insert(index, video)
+        else:
+            video = rng.choice(model)
+            assert playlist.delete_video(video.video_id) is video
+            model.remove(video)
+
+        if model:
+            video = rng.choice(model)
+            assert playlist.index_of(video.video_id) == model.index(video)
+            assert video.video_id in playlist
+    assert playlist.get_all_videos() == model
+    assert len(playlist) == len(model)
+    assert playlist.slice(5, 15) == model[5:15]
+    assert playlist.slice(len(model) - 2, len(model) + 10) == model[-2:]
+    assert playlist.get_all_videos() == model
+
+
+def test_playlist_keeps_append_order_and_membership():
+    playlist = Playlist("my_playlist")
+    videos = [_video(i) for i in range(5)]
+    for video in videos:
+        playlist.add_video(video)
+
+    assert playlist.get_all_videos() == videos
+    assert playlist.get_video("video_3_id") is videos[3]
+    assert playlist.get_video("missing") is None
+    assert playlist.delete_video("missing") is None
+
+    playlist.delete_all_vids()
+    assert playlist.get_all_videos() == []
+    assert len(playlist) == 0
+
+
+def test_playlist_page_cursor_follows_last_video():
+    playlist = Playlist("my_playlist")
+    videos = [_video(i) for i in range(5)]
+    for video in videos:
+        playlist.add_video(video)
+
+    page, cursor = playlist.get_page(limit=2)
+    assert page == videos[:2]
+    playlist.insert_video(0, _video(9))
+    page, cursor = playlist.get_page(limit=2, cursor=cursor)
+    assert page == videos[2:4]
+    page, cursor = playlist.get_page(limit=2, cursor=cursor)
+    assert page == videos[4:]
+    assert cursor is None
+
+    _, cursor = playlist.get_page(limit=1)
+    playlist.remove_at(0)
+    with pytest.raises(ValueError):
+        playlist.get_page(limit=1, cursor=cursor)
+    with pytest.raises(ValueError):
+        playlist.get_page(limit=1, cursor=encode_cursor(["video_1_id"]))
@@ -0,0 +1,157 @@
+import pytest
+from unittest import mock
+
+from src.cursor import encode_cursor
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+from src.video_search import VideoSearch
+
+
+def test_search_does_not_ask_for_input():
+    search = VideoSearch(VideoLibrary())
+    with mock.patch('builtins.input', side_effect=AssertionError):
+        titles = search.titles("cat")
+        tag = search.tag("#ANIMAL")
+        tags = search.tags("#animal NOT #cat")
+
+    assert [v.video_id for v in titles.matches] == \
+        ["amazing_cats_video_id", "another_cat_video_id"]
+    assert titles.count == 2 and titles.cursor is None
+    assert tag.count == 3
+    assert [v.video_id for v in tags.matches] == ["funny_dogs_video_id"]
+
+
+def test_search_pages_with_cursor():
+    search = VideoSearch(VideoLibrary())
+    first = search.tag("#animal", limit=2)
+    assert first.count == 3
+    assert [v.video_id for v in first.matches] == \
+        ["funny_dogs_video_id", "amazing_cats_video_id"]
+    assert first.cursor is not None
+
+    second = search.tag("#animal", limit=2, cursor=first.cursor)
+    assert [v.video_id for v in second.matches] == ["another_cat_video_id"]
+    assert second.cursor is None
+
+
+def test_search_skips_flagged_videos():
+    library = VideoLibrary()
+    library.flag_video(library.get_video("amazing_cats_video_id"), "no_cats")
+    result = VideoSearch(library).titles("cat")
+    assert [v.video_id for v in result.matches] == ["another_cat_video_id"]
+
+
+@mock.patch('builtins.input', lambda *args: 'No')
+def test_play_result(capfd):
+    player = VideoPlayer()
+    player.play_result("1")
+    player.search_videos("cat")
+    player.play_result("3")
+    player.play_result("2")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 8
+    assert "Cannot play result: No search results to choose from" in lines[0]
+    assert ("Cannot play result: Please specify a number between 1 "
+            "and 2") in lines[6]
+    assert "Playing video: Another Cat Video" in lines[7]
+
+
+def _ranked_library(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(
+        "Dogs and a catalogue | catalogue_id |\n"
+        "My Cat | my_cat_id |\n"
+        "Cat Facts | cat_facts_id | #cat\n"
+        "Concatenate | concatenate_id |\n"
+        "Cat Videos | cat_videos_id |\n"
+        "Funny Dogs | funny_dogs_id | #cat\n")
+    return VideoLibrary(catalog)
+
+
+def test_ranked_titles_orders_by_relevance(tmp_path):
+    search = VideoSearch(_ranked_library(tmp_path))
+    result = search.ranked_titles("cat", limit=10)
+    assert result.count == 5
+    assert result.cursor is None
+    assert [v.video_id for v in result.matches] == [
+        "cat_facts_id", "cat_videos_id", "my_cat_id", "concatenate_id",
+        "catalogue_id"]
+
+
+def test_ranked_titles_pages_with_cursor(tmp_path):
+    search = VideoSearch(_ranked_library(tmp_path))
+    expected = [v.video_id for v in search.ranked_titles("cat").matches]
+
+    seen = []
+    cursor = None
+    while True:
+        page = search.ranked_titles("cat", limit=2, cursor=cursor)
+        assert len(page.matches) <= 2
+        assert page.count == 5
+        seen.extend(v.video_id for v in page.matches)
+        cursor = page.cursor
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_ranked_titles_rejects_foreign_cursor(tmp_path):
+    search = VideoSearch(_ranked_library(tmp_path))
+    cursor = search.ranked_titles("cat", limit=1).cursor
+    for bad_cursor in (cursor + "!!", "not a cursor"):
+        try:
+            search.ranked_titles("dog", cursor=bad_cursor)
+        except ValueError:
+            continue
+        assert False, "expected ValueError"
+    try:
+        search.ranked_titles("dog", cursor=cursor)
+    except ValueError as e:
+        assert "different query" in str(e)
+    else:
+        assert False, "expected ValueError"
+
+
+def test_ranked_titles_rejects_empty_pages(tmp_path):
+    search = VideoSearch(_ranked_library(tmp_path))
+    for limit in (0, -1, None):
+        with pytest.raises(ValueError):
+            search.ranked_titles("cat", limit=limit)
+
+
+def test_search_cursors_are_opaque_and_checked():
+    search = VideoSearch(VideoLibrary())
+    cursor = search.titles("cat", limit=1).cursor
+    assert isinstance(cursor, str)
+    assert [v.video_id for v in search.titles("cat", cursor=cursor).matches] \
+        == ["another_cat_video_id"]
+    for bad_cursor in ("not a cursor", cursor):
+        with pytest.raises(ValueError):
+            search.tag("#cat", cursor=bad_cursor)
+
+
+def test_search_pages_reject_bad_limits_and_cursors():
+    search = VideoSearch(VideoLibrary())
+    for limit in (0, -1, True):
+        with pytest.raises(ValueError):
+            search.titles("cat", limit)
+    for cursor in (encode_cursor("cat", True), encode_cursor("cat", -1),
+                   encode_cursor("cat", "1")):
+        with pytest.raises(ValueError):
+            search.titles("cat", 1, cursor)
+
+
+def test_ranked_titles_rejects_cursor_of_wrong_types(tmp_path):
+    search = VideoSearch(_ranked_library(tmp_path))
+    for cursor in (encode_cursor("cat", "x", "y"),
+                   encode_cursor("cat", -1.5, True)):
+        with pytest.raises(ValueError):
+            search.ranked_titles("cat", cursor=cursor)
+
+
+def test_ranked_titles_with_empty_title_and_query(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(" | empty_id | #x\nCats | cats_id |\n")
+    result = VideoSearch(VideoLibrary(catalog)).ranked_titles("")
+    assert [v.video_id for v in result.matches] == ["empty_id", "cats_id"]
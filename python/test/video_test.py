@@ -0,0 +1,53 @@
+import gc
+
+from src import video as video_module
+from src.video import Video
+
+
+def test_video_has_no_instance_dict():
+    video = Video("Amazing Cats", "amazing_cats_video_id", ["#cat", "#animal"])
+    assert not hasattr(video, "__dict__")
+
+
+def test_videos_share_tag_tuples():
+    first = Video("Amazing Cats", "amazing_cats_video_id", ["#cat", "#animal"])
+    second = Video("Another Cat Video", "another_cat_video_id",
+                   ["".join(["#c", "at"]), "#animal"])
+    assert first.tags == ("#cat", "#animal")
+    assert first.tags is second.tags
+
+
+def test_flag_and_unflag_video():
+    video = Video("Amazing Cats", "amazing_cats_video_id", ["#cat"])
+    assert not video.flag
+    assert video.flag_reason == ""
+
+    video.flag_video("dont_like_cats")
+    assert video.flag
+    assert video.flag_reason == "dont_like_cats"
+
+    video.unflag_video()
+    assert not video.flag
+    assert video.flag_reason == ""
+
+
+def test_details_are_cached_until_the_video_changes():
+    video = Video("Amazing Cats", "amazing_cats_video_id", ["#cat", "#animal"])
+    assert video.details == " Amazing Cats (amazing_cats_video_id) [#cat #animal] "
+    assert video.details is video.details
+
+    video.flag_video("dont_like_cats")
+    assert video.details == (" Amazing Cats (amazing_cats_video_id) "
+                             "[#cat #animal] - FLAGGED (reason: dont_like_cats)")
+    video.unflag_video()
+    video.update("Amazing Cats 2", [])
+    assert video.details == " Amazing Cats 2 (amazing_cats_video_id) [] "
+
+
+def test_unused_tag_tuples_are_released():
+    video = Video("Amazing Cats", "amazing_cats_video_id", ["#only_here"])
+    assert ("#only_here",) in video_module._TAG_TUPLES
+
+    video.update("Amazing Cats", ["#cat"])
+    gc.collect()
+    assert ("#only_here",) not in video_module._TAG_TUPLES
@@ -1,4 +1,5 @@
 from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
 
 
 def test_library_has_all_videos():
@@ -24,3 +25,111 @@ def test_parses_video_correctly_without_tags():
     assert video.title == "Video about nothing"
     assert video.video_id == "nothing_video_id"
     assert video.tags == ()
+
+
+def test_lazy_library_matches_eager_library():
+    eager = VideoLibrary()
+    lazy = VideoLibrary(lazy=True)
+
+    assert [v.video_id for v in lazy.get_all_videos()] == \
+        [v.video_id for v in eager.get_all_videos()]
+    for video in eager.get_all_videos():
+        lazy_video = lazy.get_video(video.video_id)
+        assert lazy_video.title == video.title
+        assert lazy_video.tags == video.tags
+
+
+def test_lazy_library_builds_videos_on_demand():
+    library = VideoLibrary(lazy=True)
+    assert len(library._videos) == 5
+    assert not library._videos._videos
+
+    video = library.get_video("nothing_video_id")
+    assert video.title == "Video about nothing"
+    assert video.tags == ()
+    assert library.get_video("nothing_video_id") is video
+    assert library.get_video("does_not_exist") is None
+    assert len(library._videos._videos) == 1
+
+
+def test_counting_lazy_library_reads_no_videos(capfd):
+    library = VideoLibrary(lazy=True)
+    VideoPlayer(library).number_of_videos()
+    out, err = capfd.readouterr()
+    assert out == "5 videos in the library\n"
+    assert len(library) == 5
+    assert not library._videos._videos
+
+
+def test_lazy_library_last_duplicate_row_wins(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    catalog.write_text(
+        "Old Title | dup_id | #old\n"
+        "Other | other_id |\n"
+        "New Title | dup_id | #new , #tag\n")
+
+    for lazy in (False, True):
+        library = VideoLibrary(catalog, lazy=lazy)
+        assert [v.video_id for v in library.get_all_videos()] == \
+            ["dup_id", "other_id"]
+        video = library.get_video("dup_id")
+        assert video.title == "New Title"
+        assert video.tags == ("#new", "#tag")
+
+
+def test_parallel_library_matches_serial_library(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    rows = [f"Video {i} | video_{i % 37}_id | #tag{i % 5} , #all\n"
+            for i in range(200)]
+    rows.insert(50, "No Tags | no_tags_id |\n")
+    catalog.write_text("".join(rows))
+
+    serial = VideoLibrary(catalog)
+    parallel = VideoLibrary(catalog, workers=3)
+
+    serial_videos = serial.get_all_videos()
+    parallel_videos = parallel.get_all_videos()
+    assert len(parallel_videos) == 38
+    assert [(v.video_id, v.title, v.tags) for v in parallel_videos] == \
+        [(v.video_id, v.title, v.tags) for v in serial_videos]
+
+
+def test_videos_page_walks_titles_in_order():
+    library = VideoLibrary()
+    titles = sorted(video.title for video in library.get_all_videos())
+
+    seen = []
+    videos, cursor = library.get_videos_page(limit=2)
+    while cursor:
+        seen += [video.title for video in videos]
+        videos, cursor = library.get_videos_page(limit=2, cursor=cursor)
+    seen += [video.title for video in videos]
+    assert seen == titles
+
+    videos, cursor = library.get_videos_page(limit=2, offset=3)
+    assert [video.title for video in videos] == titles[3:5]
+    assert cursor is None
+
+
+def test_videos_page_cursor_survives_inserts(tmp_path):
+    catalog = tmp_path / "videos.txt"
+    rows = ["Banana | banana_id | ", "Cherry | cherry_id | ",
+            "Damson | damson_id | "]
+    catalog.write_text("\n".join(rows))
+    library = VideoLibrary(catalog)
+    videos, cursor = library.get_videos_page(limit=1)
+    assert [video.title for video in videos] == ["Banana"]
+
+    catalog.write_text("\n".join(["Apple | apple_id | "] + rows))
+    library.reload()
+    videos, cursor = library.get_videos_page(limit=1, cursor=cursor)
+    assert [video.title for video in videos] == ["Cherry"]
+
+
+def test_iter_videos_by_title_seeks_to_title():
+    library = VideoLibrary()
+    titles = [video.title for video in library.iter_videos_by_title()]
+    assert titles == sorted(video.title for video in library.get_all_videos())
+
+    videos = library.iter_videos_by_title("Funny")
+    assert [video.title for video in videos] == titles[2:]